@@ -3,13 +3,17 @@
 
 from flask import Flask, jsonify
 from models import storage
+from api.v1.compression import compress
+from api.v1.json_provider import JSONProvider
 from api.v1.views import app_views
 import os
 from flask_cors import CORS
 
 
 app = Flask(__name__)
+app.json = JSONProvider(app)
 app.register_blueprint(app_views)
+app.after_request(compress)
 
 
 @app.teardown_appcontext
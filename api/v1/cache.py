@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""Cache of the encoded responses of the GET endpoints
+
+Entries live in models.cache, in the process or shared by every worker
+through the cache server, see models.engine.backends. They are keyed by
+path, query string and negotiated media type, and remember the storage
+generations of the classes the response was built from: an entry whose
+classes changed since, in any worker, is not served. HBNB_API_CACHE_TTL
+sets the seconds an entry is kept (0, the default, disables the cache)
+and HBNB_API_CACHE_BYTES the largest body kept.
+"""
+
+import marshal
+import models
+import os
+import threading
+
+
+class ResponseCache:
+    """cache of (status, headers, body) responses kept in a backend of
+    models.engine.backends"""
+
+    def __init__(self, backend, ttl, max_bytes):
+        """Instantiate a ResponseCache keeping responses of up to max_bytes
+        bytes in backend for ttl seconds"""
+        self.backend = backend
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    def lookup(self, key, names):
+        """returns the (status, headers, body) stored under key for the
+        current generations of the classes names, or None, and the tuple
+        of those generations, read along in a single call"""
+        (value,), generations = self.backend.lookup(("response:" + key,),
+                                                    names)
+        generations = tuple(generations)
+        entry = None
+        if value is not None:
+            entry = marshal.loads(value)
+            if entry[0] != generations:
+                entry = None
+        with self.lock:
+            if entry is not None:
+                self.hits += 1
+                return entry[1:], generations
+            if value is not None:
+                self.invalidations += 1
+            self.misses += 1
+        return None, generations
+
+    def put(self, key, generations, status, headers, body):
+        """stores the response (status, headers, body) under key, built
+        from the storage at generations"""
+        if not self.ttl or len(body) > self.max_bytes:
+            return
+        self.backend.store("response:" + key,
+                           marshal.dumps((generations, status, headers,
+                                          body)), self.ttl)
+
+    def stats(self):
+        """returns the metrics of the cache"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_ratio": self.hits / lookups if lookups else 0.0,
+                    "invalidations": self.invalidations}
+
+
+responses = ResponseCache(models.cache,
+                          float(os.getenv('HBNB_API_CACHE_TTL', '0')),
+                          int(os.getenv('HBNB_API_CACHE_BYTES',
+                                        str(64 * 1024 * 1024))))
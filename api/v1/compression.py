@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""Compression of the responses of the v1 API
+
+The encoding is negotiated from Accept-Encoding among the ones listed by
+HBNB_API_COMPRESS, "br,gzip,deflate" by default, br being skipped when
+the brotli module is not installed and an empty list disabling
+compression. JSON and text bodies of at least HBNB_API_COMPRESS_MIN bytes
+(1024) are compressed; streamed bodies, whose size is not known, always
+are, chunk by chunk as they are sent.
+"""
+
+from flask import request
+import gzip
+import os
+import zlib
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# tuple - encodings offered, preferred first when the client has no
+# preference
+encodings = tuple(name for name in os.getenv("HBNB_API_COMPRESS",
+                                             "br,gzip,deflate").split(",")
+                  if name in ("gzip", "deflate") or
+                  (name == "br" and brotli is not None))
+# integer - smallest body compressed
+min_size = int(os.getenv("HBNB_API_COMPRESS_MIN", "1024"))
+# integers - compression levels, fast enough for dynamic content
+level = 6
+brotli_quality = 5
+compressible = ("application/json", "application/x-ndjson",
+                "application/ndjson")
+
+
+def compress_body(encoding, data):
+    """returns data compressed with encoding"""
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    return zlib.compress(data, level)
+
+
+def compress_stream(encoding, chunks):
+    """yields the chunks of a body, strings or bytes, compressed with
+    encoding as one stream"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=brotli_quality)
+        process, finish = compressor.process, compressor.finish
+    else:
+        # gzip header and trailer, or the zlib ones for deflate
+        compressor = zlib.compressobj(level, zlib.DEFLATED,
+                                      31 if encoding == "gzip" else 15)
+        process, finish = compressor.compress, compressor.flush
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def compress(response):
+    """after_request hook compressing response with the encoding the
+    client accepts"""
+    if not encodings or response.direct_passthrough or \
+            response.status_code < 200 or \
+            response.status_code in (204, 206, 304) or \
+            "Content-Encoding" in response.headers or \
+            not (response.mimetype in compressible or
+                 response.mimetype.startswith("text/")):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(encodings)
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        response.response = compress_stream(encoding, response.response)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        response.set_data(compress_body(encoding, data))
+    response.headers["Content-Encoding"] = encoding
+    return response
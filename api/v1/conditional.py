@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+"""ETags and conditional GET for the v1 API
+
+An object's ETag is made of its id and updated_at. A collection's ETag
+is made of the storage generations of the classes it is built from, of
+the query string and of the negotiated media type, so that it changes
+with any object of those classes. A request whose If-None-Match matches
+gets a 304 before any object is serialized. The responses are also kept
+in the response cache of api.v1.cache when it is enabled.
+
+The generations live in models.cache: with the cache server, a write in
+one worker changes the ETags and drops the cached responses of all.
+While the server is unreachable lists get no ETag and nothing is cached.
+Neither do lists get one from DBStorage without the cache server, whose
+generations would miss the writes of the other processes.
+"""
+
+from functools import wraps
+from flask import jsonify, make_response, request, Response
+from api.v1 import cache
+from api.v1.streaming import wants_ndjson
+import models
+from models import storage
+from models.base_model import format_time
+import zlib
+
+
+def entity_etag(obj):
+    """returns the ETag of obj"""
+    return "{}-{}".format(obj.id, format_time(obj.updated_at))
+
+
+def collection_etag(generations):
+    """returns the ETag of a collection of the request built from objects
+    whose classes are at generations"""
+    variant = "{}|{}".format(request.query_string.decode(), wants_ndjson())
+    # the token tells the generations of the cache apart from the ones of
+    # another cache or of a previous run, which started over
+    return "{}-{}-{:x}".format(
+        models.cache.token, ".".join(str(g) for g in generations),
+        zlib.crc32(variant.encode()))
+
+
+def not_modified(etag):
+    """returns a 304 response if the request's If-None-Match lists etag,
+    else None"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def get_entity(obj):
+    """Returns the JSON representation of obj, or a 304 response if the
+    client already has it"""
+    etag = entity_etag(obj)
+    response = not_modified(etag)
+    if response is None:
+        response = jsonify(obj.to_dict())
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def depends_on(*classes, entity=False):
+    """decorator of the GET views whose responses are built from objects
+    of classes
+
+    Lists get an ETag made of the generations of classes, and a request
+    whose If-None-Match matches it a 304 before the view runs; entity
+    marks the views of single objects, which set their own ETag. When
+    api.v1.cache.responses is enabled the responses are kept there until
+    an object of classes changes.
+    """
+    def decorator(view):
+        """wraps view"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """answers from the ETag or the cache, or calls view"""
+            # read before the view, so that the entry of a response built
+            # while objects changed is stale already
+            key = "{}?{}|{}".format(request.path,
+                                    request.query_string.decode(),
+                                    wants_ndjson())
+            entry = None
+            if cache.responses.ttl:
+                entry, generations = cache.responses.lookup(
+                    key, [cls.__name__ for cls in classes])
+            else:
+                generations = storage.class_generations(classes)
+            # unknown while the cache server is unreachable
+            known = None not in generations
+            etag = None
+            if not entity and known and storage.tracks_writes():
+                etag = collection_etag(generations)
+                response = not_modified(etag)
+                if response is not None:
+                    return response
+            if entry is not None:
+                response = Response(entry[2], status=entry[0],
+                                    headers=entry[1])
+                stored = response.get_etag()[0]
+                if stored is not None and entity:
+                    return not_modified(stored) or response
+                return response
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                if etag is not None:
+                    response.set_etag(etag, weak=True)
+                if cache.responses.ttl and known:
+                    keep(response, key, generations)
+            return response
+        return wrapper
+    return decorator
+
+
+def keep(response, key, generations):
+    """stores response in the cache under key once its body is sent"""
+    headers = [(name, value) for name, value in response.headers
+               if name != 'Content-Length']
+    if not response.is_streamed:
+        cache.responses.put(key, generations, response.status_code,
+                            headers, response.get_data())
+        return
+
+    def record(chunks):
+        """yields chunks, storing the body once they were all sent"""
+        body = []
+        size = 0
+        for chunk in chunks:
+            yield chunk
+            if body is not None:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                size += len(chunk)
+                body.append(chunk)
+                if size > cache.responses.max_bytes:
+                    body = None
+        if body is not None:
+            cache.responses.put(key, generations, response.status_code,
+                                headers, b"".join(body))
+
+    response.response = record(response.response)
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""JSON provider of the v1 API
+
+orjson, when it is installed, encodes and decodes the JSON of the API an
+order of magnitude faster than the json module, which is used otherwise
+or when HBNB_API_JSON is "json". Either way datetimes are written in the
+time format of BaseModel, as to_dict() does, rather than as HTTP dates.
+"""
+
+from datetime import datetime
+from flask.json.provider import DefaultJSONProvider
+from models.base_model import format_time
+import os
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider encoding with orjson when it is available"""
+
+    # module - the fast encoder, or None to use the json module
+    fast = orjson if os.getenv("HBNB_API_JSON", "orjson") != "json" \
+        else None
+
+    @staticmethod
+    def default(o):
+        """returns the JSON encodable form of o"""
+        if isinstance(o, datetime):
+            return format_time(o)
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        """returns the JSON encoding of obj"""
+        if self.fast is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        """returns the object decoded from the JSON document s"""
+        if self.fast is None or kwargs:
+            return super().loads(s, **kwargs)
+        return self.fast.loads(s)
+
+    def encode(self, obj):
+        """returns the compact JSON encoding of obj as bytes, with orjson,
+        falling back to the json module for what orjson rejects, such as
+        integers over 64 bits"""
+        options = self.fast.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= self.fast.OPT_SORT_KEYS
+        try:
+            return self.fast.dumps(obj, default=self.default,
+                                   option=options)
+        except self.fast.JSONEncodeError:
+            return super().dumps(obj).encode()
+
+    def response(self, *args, **kwargs):
+        """returns a response with the JSON encoding of the arguments, as
+        jsonify() does"""
+        if self.fast is None or self.compact is False or \
+                (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.encode(obj) + b"\n",
+                                        mimetype=self.mimetype)
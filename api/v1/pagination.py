@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""Keyset pagination and field projection for the list endpoints"""
+
+import base64
+import binascii
+from api.v1.streaming import stream_json
+from flask import abort, request
+from models import storage
+from models.base_model import format_time, parse_time
+from urllib.parse import urlencode
+
+
+def encode_cursor(obj):
+    """returns the opaque cursor pointing right after obj"""
+    key = "{}|{}".format(format_time(obj.created_at), obj.id)
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """returns the (created_at, id) tuple encoded in cursor"""
+    try:
+        key = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, id = key.split("|", 1)
+        return parse_time(created_at), id
+    except (binascii.Error, UnicodeError, ValueError):
+        abort(400, description="Invalid cursor")
+
+
+def page_args():
+    """returns the limit, cursor and fields arguments of the request"""
+    limit = request.args.get('limit')
+    if limit is not None:
+        if not limit.isdecimal() or int(limit) < 1:
+            abort(400, description="Invalid limit")
+        limit = int(limit)
+    after = request.args.get('cursor')
+    if after is not None:
+        after = decode_cursor(after)
+    fields = request.args.get('fields')
+    if fields is not None:
+        fields = [field for field in fields.split(',') if field]
+    return limit, after, fields
+
+
+def paginate(cls, attr=None, id=None, objs=None, hidden=()):
+    """Returns the streamed JSON list of the objects of class cls
+
+    The objects come from storage.page(), restricted to the ones whose
+    attr refers to id if given, or from objs when they were already
+    fetched. ?limit= and ?cursor= page through them in (created_at, id)
+    order, and a Link header points to the next page. ?fields= keeps only
+    the listed keys of each object, and hidden keys are always removed.
+    """
+    limit, after, fields = page_args()
+    if objs is None:
+        objs = storage.page(cls, limit + 1 if limit else None, after,
+                            attr, id)
+    elif limit is not None or after is not None:
+        objs = sorted(objs, key=lambda obj: (obj.created_at, obj.id))
+        if after is not None:
+            objs = [obj for obj in objs if (obj.created_at, obj.id) > after]
+
+    next_cursor = None
+    if limit is not None:
+        objs = list(objs)
+        if len(objs) > limit:
+            objs = objs[:limit]
+            next_cursor = encode_cursor(objs[-1])
+
+    def serialize():
+        """yields the projected dictionary of each object"""
+        for obj in objs:
+            if fields is None and not hidden:
+                yield obj.to_json()
+                continue
+            obj_dict = obj.to_dict()
+            if fields is not None:
+                obj_dict = {k: obj_dict[k] for k in fields if k in obj_dict}
+            for key in hidden:
+                obj_dict.pop(key, None)
+            yield obj_dict
+
+    response = stream_json(serialize())
+    if next_cursor is not None:
+        args = request.args.to_dict()
+        args['cursor'] = next_cursor
+        response.headers['Link'] = '<{}?{}>; rel="next"'.format(
+            request.base_url, urlencode(args))
+    return response
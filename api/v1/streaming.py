@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""Streaming JSON and NDJSON responses for large collections"""
+
+from flask import current_app, request, Response, stream_with_context
+
+ndjson_types = ('application/x-ndjson', 'application/ndjson')
+# number of items encoded together before a chunk is sent
+chunk_size = 100
+
+
+def wants_ndjson():
+    """tells whether the client prefers NDJSON over a JSON array"""
+    best = request.accept_mimetypes.best_match(('application/json',) +
+                                               ndjson_types)
+    return best in ndjson_types
+
+
+def stream_json(items):
+    """Returns a response streaming the JSON encoding of the items iterable
+
+    The items, dictionaries or already encoded strings, are encoded chunk
+    by chunk as the body is sent, as a JSON array or, when the Accept
+    header asks for it, as one JSON document per line, so neither the
+    whole list nor its encoding is ever held in memory.
+    """
+    dumps = current_app.json.dumps
+    ndjson = wants_ndjson()
+
+    def encode(chunk, first):
+        """returns the body text of a chunk of encoded items"""
+        if ndjson:
+            return '\n'.join(chunk) + '\n'
+        return ('' if first else ',') + ','.join(chunk)
+
+    def generate():
+        """yields the encoded body chunk by chunk"""
+        if not ndjson:
+            yield '['
+        chunk = []
+        first = True
+        for item in items:
+            chunk.append(item if isinstance(item, str) else dumps(item))
+            if len(chunk) == chunk_size:
+                yield encode(chunk, first)
+                chunk = []
+                first = False
+        if chunk:
+            yield encode(chunk, first)
+        if not ndjson:
+            yield ']\n'
+
+    mimetype = ndjson_types[0] if ndjson else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
@@ -4,27 +4,28 @@
 from flask import jsonify, abort, request
 from models import storage
 from models.amenity import Amenity
+from api.v1.conditional import depends_on, get_entity
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
+@depends_on(Amenity)
 def get_amenities():
     """Retrieves the list of all Amenity objects"""
-    amenities = [amenity.to_dict()
-                 for amenity in storage.all(Amenity).values()]
-
-    return jsonify(amenities)
+    return paginate(Amenity)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['GET'],
                  strict_slashes=False)
+@depends_on(Amenity, entity=True)
 def get_amenity(amenity_id):
     """Retrieves a specific Amenity object by ID"""
     amenity = storage.get(Amenity, amenity_id)
     if amenity is None:
         abort(404)
 
-    return jsonify(amenity.to_dict())
+    return get_entity(amenity)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['DELETE'],
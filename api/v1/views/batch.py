@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""Creates many objects of a collection with a single storage write"""
+
+from flask import abort, request
+from api.v1.streaming import stream_json
+from api.v1.views import app_views
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+# dictionary - collection -> (class, required keys, {reference: class})
+batch_classes = {
+    "amenities": (Amenity, ("name",), {}),
+    "cities": (City, ("state_id", "name"), {"state_id": State}),
+    "places": (Place, ("city_id", "user_id", "name"),
+               {"city_id": City, "user_id": User}),
+    "reviews": (Review, ("place_id", "user_id", "text"),
+                {"place_id": Place, "user_id": User}),
+    "states": (State, ("name",), {}),
+    "users": (User, ("email", "password"), {}),
+}
+
+
+@app_views.route('/<collection>/batch', methods=['POST'],
+                 strict_slashes=False)
+def create_batch(collection):
+    """Creates the objects of the JSON list of the request
+
+    Each item is checked as by the single object endpoints, the objects
+    it refers to being looked up once, then every object is written by
+    storage.bulk_new() and bulk_save(). Nothing is written when an item is
+    invalid.
+    """
+    if collection not in batch_classes:
+        abort(404)
+    cls, required, references = batch_classes[collection]
+
+    req_json = request.get_json(silent=True)
+    if not isinstance(req_json, list):
+        abort(400, 'Not a JSON list')
+
+    found = set()
+    objs = []
+    for item in req_json:
+        if not isinstance(item, dict):
+            abort(400, 'Not a JSON')
+        for key in required:
+            if key not in item:
+                abort(400, 'Missing ' + key)
+        for key, ref in references.items():
+            if not isinstance(item[key], str):
+                abort(400, 'Invalid ' + key)
+            if (ref, item[key]) not in found:
+                if storage.get(ref, item[key]) is None:
+                    abort(404)
+                found.add((ref, item[key]))
+        objs.append(cls(**item))
+
+    storage.bulk_new(objs)
+    storage.bulk_save()
+    response = stream_json(obj.to_dict() for obj in objs)
+    response.status_code = 201
+    return response
@@ -5,29 +5,32 @@ from flask import jsonify, abort, request
 from models import storage
 from models.state import State
 from models.city import City
+from api.v1.conditional import depends_on, get_entity
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 
 
 @app_views.route('/states/<state_id>/cities', methods=['GET'],
                  strict_slashes=False)
+@depends_on(State, City)
 def get_cities(state_id):
     """Retrieves the list of all City objects of a State"""
     state = storage.get(State, state_id)
     if state is None:
         abort(404)
 
-    cities = [city.to_dict() for city in state.cities]
-    return jsonify(cities)
+    return paginate(City, "state_id", state_id)
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'], strict_slashes=False)
+@depends_on(City, entity=True)
 def get_city(city_id):
     """Retrieves a City object"""
     city = storage.get(City, city_id)
     if city is None:
         abort(404)
 
-    return jsonify(city.to_dict())
+    return get_entity(city)
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'], strict_slashes=False)
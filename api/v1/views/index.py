@@ -1,7 +1,10 @@
 #!/usr/bin/python3
 """Index view for API status"""
-from flask import jsonify
+from flask import jsonify, request
+from api.v1 import cache
+from api.v1.conditional import depends_on
 from api.v1.views import app_views
+import models
 from models import storage
 from models.amenity import Amenity
 from models.city import City
@@ -9,6 +12,15 @@ from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+import os
+import threading
+import time
+
+# float - seconds the /stats counts are reused, 0 counts at every request
+stats_ttl = float(os.getenv('HBNB_API_STATS_TTL', '0'))
+# dictionary - (approximate, detailed) flags -> (expiry time, stats)
+stats_cache = {}
+stats_lock = threading.Lock()
 
 
 @app_views.route('/status', methods=['GET'], strict_slashes=False)
@@ -17,15 +29,41 @@ def get_status():
     return jsonify({"status": "OK"})
 
 
+@app_views.route('/metrics', methods=['GET'], strict_slashes=False)
+def get_metrics():
+    """Returns the metrics of the response cache and of the cache backend
+    holding it"""
+    return jsonify({"response_cache": cache.responses.stats(),
+                    "cache": models.cache.stats()})
+
+
 @app_views.route('/stats', methods=['GET'], strict_slashes=False)
+@depends_on(Amenity, City, Place, Review, State, User)
 def get_stats():
-    """Returns the number of each object by type"""
-    stats = {
-        "amenities": storage.count(Amenity),
-        "cities": storage.count(City),
-        "places": storage.count(Place),
-        "reviews": storage.count(Review),
-        "states": storage.count(State),
-        "users": storage.count(User)
-    }
+    """Returns the number of each object by type
+
+    The counts come from the live counters of storage.counts(), estimated
+    with ?approximate=1, and are reused for HBNB_API_STATS_TTL seconds.
+    ?detailed=1 adds the number of places of each state and city.
+    """
+    approximate = request.args.get('approximate') == '1'
+    detailed = request.args.get('detailed') == '1'
+    now = time.monotonic()
+    with stats_lock:
+        expires, stats = stats_cache.get((approximate, detailed), (0, None))
+        if now >= expires:
+            counts = storage.counts(approximate)
+            stats = {
+                "amenities": counts["Amenity"],
+                "cities": counts["City"],
+                "places": counts["Place"],
+                "reviews": counts["Review"],
+                "states": counts["State"],
+                "users": counts["User"]
+            }
+            if detailed:
+                places = storage.place_counts()
+                stats["places_by_state"] = places["states"]
+                stats["places_by_city"] = places["cities"]
+            stats_cache[(approximate, detailed)] = (now + stats_ttl, stats)
     return jsonify(stats)
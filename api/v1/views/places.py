@@ -3,34 +3,35 @@
 
 from flask import jsonify, abort, request
 from models import storage
-from models.amenity import Amenity
 from models.city import City
 from models.place import Place
-from models.state import State
 from models.user import User
+from api.v1.conditional import depends_on, get_entity
+from api.v1.pagination import page_args, paginate
 from api.v1.views import app_views
 
 
 @app_views.route('/cities/<city_id>/places', methods=['GET'],
                  strict_slashes=False)
+@depends_on(City, Place)
 def get_places(city_id):
     """Retrieves the list of all Place objects of a City"""
     city = storage.get(City, city_id)
     if city is None:
         abort(404)
 
-    places = [place.to_dict() for place in city.places]
-    return jsonify(places)
+    return paginate(Place, "city_id", city_id)
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
+@depends_on(Place, entity=True)
 def get_place(place_id):
     """Retrieves a specific Place object by ID"""
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
 
-    return jsonify(place.to_dict())
+    return get_entity(place)
 
 
 @app_views.route('/places/<place_id>', methods=['DELETE'],
@@ -99,38 +100,14 @@ def search_places():
     if request.content_type != "application/json":
         abort(400, description="Not a JSON")
 
-    places = storage.all(Place).values()
-
     req_json = request.get_json()
-    states_ids = req_json.get('states', [])
-    cities_ids = req_json.get('cities', [])
-    amenities_ids = req_json.get('amenities', [])
-    if not req_json or not (states_ids or cities_ids or amenities_ids):
-        return jsonify([place.to_dict() for place in places])
-
-    states = [storage.get(State, id) for id in states_ids]
-    cities = [storage.get(City, id) for id in cities_ids]
-
-    states = [state for state in states if state]
-    cities = [city for city in cities if city]
-
-    states_cities = [city for state in states for city in state.cities]
-    req_cities = [city for city in cities if city not in states_cities]
-    req_cities.extend(states_cities)
-
-    amenities = [storage.get(Amenity, id) for id in amenities_ids]
-    amenities = [amenity for amenity in amenities if amenity]
-
-    req_places = [place for city in req_cities
-                  for place in city.places]
-    if not req_places:
-        req_places = places
-
-    req_places = [place.to_dict() for place in req_places
-                  if all(amenity in place.amenities
-                         for amenity in amenities)]
-    for place in req_places:
-        if 'amenities' in place:
-            del place['amenities']
-
-    return jsonify(req_places)
+    if req_json is None:
+        abort(400, 'Not a JSON')
+
+    limit, after, fields = page_args()
+    places = storage.search_places(states=req_json.get('states', []),
+                                   cities=req_json.get('cities', []),
+                                   amenities=req_json.get('amenities', []),
+                                   limit=limit + 1 if limit else None,
+                                   after=after)
+    return paginate(Place, objs=places, hidden=('amenities',))
@@ -5,6 +5,8 @@ Amenity objects that handles all default RESTFul API actions
 """
 
 from flask import jsonify, abort
+from api.v1.conditional import depends_on
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 from models import storage
 from models import storage_t
@@ -14,6 +16,7 @@ from models.amenity import Amenity
 
 @app_views.route('/places/<place_id>/amenities',
                  methods=['GET'], strict_slashes=False)
+@depends_on(Place, Amenity)
 def get_place_aminities(place_id):
     """Retrieves the list of all Amenity objects of a Place"""
 
@@ -21,13 +24,7 @@ def get_place_aminities(place_id):
     if not place:
         abort(404)
 
-    if storage_t == 'db':
-        place_aminities = [amenity.to_dict() for amenity in place.amenities]
-    else:
-        place_aminities = [(storage.get("Amenity", amenity_id).to_dict()
-                            for amenity_id in place.amenity_ids)]
-
-    return jsonify(place_aminities)
+    return paginate(Amenity, objs=place.amenities)
 
 
 @app_views.route('/places/<place_id>/amenities/<amenity_id>',
@@ -48,11 +45,11 @@ def delete_place_amenity(place_id, amenity_id):
             storage.save()
             return jsonify({}), 200
     else:
-        if amenity not in place.amenity_ids:
+        if amenity.id not in place.amenity_ids:
             abort(404)
         else:
             place.amenity_ids.remove(amenity.id)
-            storage.save()
+            place.save()
             return jsonify({}), 200
 
 
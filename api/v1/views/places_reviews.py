@@ -6,28 +6,31 @@ from models import storage
 from models.review import Review
 from models.place import Place
 from models.user import User
+from api.v1.conditional import depends_on, get_entity
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 
 
 @app_views.route('/places/<place_id>/reviews', methods=['GET'],
                  strict_slashes=False)
+@depends_on(Place, Review)
 def get_reviews(place_id):
     """Retrieves the list of all Review objects of a Place"""
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
-    reviews = [review.to_dict() for review in place.reviews]
-    return jsonify(reviews)
+    return paginate(Review, "place_id", place_id)
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'],
                  strict_slashes=False)
+@depends_on(Review, entity=True)
 def get_review(review_id):
     """Retrieves a specific Review object by ID"""
     review = storage.get(Review, review_id)
     if review is None:
         abort(404)
-    return jsonify(review.to_dict())
+    return get_entity(review)
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'],
@@ -6,25 +6,28 @@ all default RESTFul API actions
 
 from flask import jsonify, abort, request
 from models.state import State
+from api.v1.conditional import depends_on, get_entity
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 from models import storage
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
+@depends_on(State)
 def get_states():
     """Retrieves the list of all State objects"""
-    states = [state.to_dict() for state in storage.all(State).values()]
-    return jsonify(states)
+    return paginate(State)
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
+@depends_on(State, entity=True)
 def get_state(state_id):
     """Retrieves a State object"""
     state = storage.get(State, state_id)
     if state is None:
         abort(404)
 
-    return jsonify(state.to_dict())
+    return get_entity(state)
 
 
 @app_views.route('/states/<state_id>', methods=['DELETE'],
@@ -4,23 +4,26 @@
 from flask import jsonify, abort, request
 from models import storage
 from models.user import User
+from api.v1.conditional import depends_on, get_entity
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
+@depends_on(User)
 def get_users():
     """Retrieves the list of all User objects"""
-    users = [user.to_dict() for user in storage.all(User).values()]
-    return jsonify(users)
+    return paginate(User)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
+@depends_on(User, entity=True)
 def get_user(user_id):
     """Retrieves a specific User object by ID"""
     user = storage.get(User, user_id)
     if user is None:
         abort(404)
-    return jsonify(user.to_dict())
+    return get_entity(user)
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'], strict_slashes=False)
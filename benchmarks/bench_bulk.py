@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""
+Measures how many reviews per second the storage engine writes one at a
+time with save() and all at once with bulk_new() and bulk_save()
+
+usage: python3 -m benchmarks.bench_bulk [reviews]
+FileStorage works on a temporary file, DBStorage on the configured
+database, e.g. HBNB_TYPE_STORAGE=db HBNB_MYSQL_URL=sqlite:////tmp/bench.db
+"""
+
+import models
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import os
+import sys
+import tempfile
+import time
+
+
+def run(storage, reviews, place, user, bulk):
+    """returns the reviews per second written one at a time or in bulk"""
+    objs = [Review(text=str(i), place_id=place.id, user_id=user.id)
+            for i in range(reviews)]
+    start = time.perf_counter()
+    if bulk:
+        storage.bulk_new(objs)
+        storage.bulk_save()
+    else:
+        for obj in objs:
+            storage.new(obj)
+            storage.save()
+    return reviews / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    reviews = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    storage = models.storage
+    if models.storage_t != "db":
+        path = os.path.join(tempfile.mkdtemp(), "file.json")
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__objects = {}
+    user = User(email="bench@hbnb.io", password="bench")
+    state = State(name="Bench")
+    city = City(name="Bench", state_id=state.id)
+    place = Place(name="Bench", city_id=city.id, user_id=user.id)
+    for obj in (user, state, city, place):
+        storage.new(obj)
+    storage.save()
+    # one at a time is far slower, a sample is enough
+    print("save()      {:>10.0f} reviews/sec".format(
+        run(storage, min(reviews, 500), place, user, False)))
+    print("bulk_save() {:>10.0f} reviews/sec".format(
+        run(storage, reviews, place, user, True)))
+    if models.storage_t != "db":
+        for name in os.listdir(os.path.dirname(path)):
+            os.remove(os.path.join(os.path.dirname(path), name))
+        os.rmdir(os.path.dirname(path))
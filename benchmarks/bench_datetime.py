@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+"""
+Measures how many objects per second BaseModel loads from and dumps to
+dictionaries, with the strptime/strftime datetime codec and with the
+fromisoformat/isoformat one of models/base_model.py
+
+usage: python3 -m benchmarks.bench_datetime [number of objects]
+"""
+
+from datetime import datetime
+from models import base_model
+from models.state import State
+import sys
+import timeit
+
+codecs = {
+    "strptime/strftime": (lambda s: datetime.strptime(s, base_model.time),
+                          lambda d: d.strftime(base_model.time)),
+    "fromisoformat/isoformat": (base_model.parse_time,
+                                base_model.format_time),
+}
+
+
+def run(dicts):
+    """loads every dictionary into a State and dumps it back"""
+    for d in dicts:
+        State(**d).to_dict()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    dicts = [State(name="State{}".format(i)).to_dict() for i in range(n)]
+    parse_time, format_time = base_model.parse_time, base_model.format_time
+    for name, (parse, fmt) in codecs.items():
+        base_model.parse_time, base_model.format_time = parse, fmt
+        seconds = min(timeit.repeat(lambda: run(dicts), number=1, repeat=3))
+        print("{:<24} {:>10.0f} objects/sec".format(name, n / seconds))
+    base_model.parse_time, base_model.format_time = parse_time, format_time
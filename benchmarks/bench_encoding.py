@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""
+Measures how fast the API's JSON provider encodes a list of places with
+the json module and with orjson, and how much each encoding offered by
+api/v1/compression.py shrinks it
+
+usage: python3 -m benchmarks.bench_encoding [places]
+"""
+
+from api.v1 import compression, json_provider
+from api.v1.app import app
+from models.place import Place
+import sys
+import timeit
+
+
+def best(function, number=5):
+    """returns the shortest time function took over number runs"""
+    return min(timeit.repeat(function, number=1, repeat=number))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    places = [Place(name="Place {}".format(i), city_id="c", user_id="u",
+                    description="A nice place " * 4, number_rooms=i % 5,
+                    latitude=37.77, longitude=-122.42).to_dict()
+              for i in range(count)]
+    fast = json_provider.orjson
+    for name, module in (("json", None), ("orjson", fast)):
+        if name == "orjson" and fast is None:
+            print("orjson      not installed")
+            continue
+        json_provider.JSONProvider.fast = module
+        provider = json_provider.JSONProvider(app)
+        seconds = best(lambda: provider.dumps(places))
+        print("{:<11} {:>10.0f} places/sec".format(name, count / seconds))
+    body = provider.dumps(places).encode()
+    print("{:<11} {:>10} bytes".format("identity", len(body)))
+    for encoding in compression.encodings:
+        data = compression.compress_body(encoding, body)
+        seconds = best(lambda: compression.compress_body(encoding, body))
+        print("{:<11} {:>10} bytes {:>8.1f} ms".format(
+            encoding, len(data), seconds * 1000))
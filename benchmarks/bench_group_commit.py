@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+Measures how many saves per second threads each saving a new State reach
+with FileStorage saving right away and with group commit
+
+usage: python3 -m benchmarks.bench_group_commit [threads] [saves]
+"""
+
+from models.engine.file_storage import FileStorage
+from models.engine.journal import Journal
+from models.state import State
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+def run(storage, threads, saves):
+    """returns the saves per second of threads threads saving saves times"""
+    def work():
+        """creates and saves states"""
+        for i in range(saves):
+            storage.new(State(name=str(i)))
+            storage.save()
+
+    workers = [threading.Thread(target=work) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return threads * saves / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    saves = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    path = os.path.join(tempfile.mkdtemp(), "file.json")
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__journal = Journal(path + ".journal")
+    storage = FileStorage()
+    for window in (0, 2):
+        FileStorage._FileStorage__objects = {}
+        # a store the size of a small deployment, rewritten by every commit
+        for i in range(5000):
+            storage.new(State(name=str(i)))
+        storage.compact()
+        FileStorage._FileStorage__commit_window = window / 1000
+        print("window {} ms {:>10.0f} saves/sec".format(
+            window, run(storage, threads, saves)))
+    for name in os.listdir(os.path.dirname(path)):
+        os.remove(os.path.join(os.path.dirname(path), name))
+    os.rmdir(os.path.dirname(path))
@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""
+Measures how many bytes FileStorage holds per object after reload() in
+the eager, lazy and compact HBNB_FILE_LOAD modes
+
+usage: python3 -m benchmarks.bench_memory [number of objects]
+"""
+
+from models.engine.file_storage import FileStorage
+from models.engine.journal import Journal
+from models.place import Place
+import os
+import sys
+import tempfile
+import tracemalloc
+
+
+def measure(storage, mode):
+    """returns the bytes allocated by reload() in mode, per object"""
+    FileStorage._FileStorage__load_mode = mode
+    FileStorage._FileStorage__objects = {}
+    tracemalloc.start()
+    storage.reload()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / storage.count()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    path = os.path.join(tempfile.mkdtemp(), "file.json")
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__journal = Journal(path + ".journal")
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    for i in range(n):
+        storage.new(Place(name="Place{}".format(i), city_id=str(i % 100),
+                          user_id=str(i % 1000), number_rooms=i % 5))
+    storage.compact()
+    for mode in ("eager", "lazy", "compact"):
+        size = measure(storage, mode)
+        print("{:<8} {:>8.0f} bytes/object".format(mode, size))
+    os.remove(path)
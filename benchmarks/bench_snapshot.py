@@ -0,0 +1,36 @@
+#!/usr/bin/python3
+"""
+Measures how many objects per second the JSON and binary snapshot
+serializers of models/engine/serializers.py write and read
+
+usage: python3 -m benchmarks.bench_snapshot [number of objects]
+"""
+
+from models.engine.serializers import formats
+from models.place import Place
+import os
+import sys
+import tempfile
+import timeit
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    objects = {}
+    for i in range(n):
+        place = Place(name="Place{}".format(i), city_id=str(i % 100),
+                      user_id=str(i % 1000), number_rooms=i % 5)
+        objects["Place." + place.id] = place.to_dict()
+    directory = tempfile.mkdtemp()
+    for name, serializer in formats.items():
+        path = os.path.join(directory, serializer.path)
+        dump = min(timeit.repeat(
+            lambda: serializer.dump(path, objects.items()),
+            number=1, repeat=3))
+        load = min(timeit.repeat(lambda: serializer.load(path),
+                                 number=1, repeat=3))
+        print("{:<8} save {:>10.0f} objects/sec  reload {:>10.0f} "
+              "objects/sec  {:>6} bytes/object".format(
+                  name, n / dump, n / load, os.path.getsize(path) // n))
+        os.remove(path)
+    os.rmdir(directory)
@@ -3,10 +3,13 @@
 initialize the models package
 """
 
+from models.engine.backends import configured
 from os import getenv
 
 
 storage_t = getenv("HBNB_TYPE_STORAGE")
+# cache backend of the storage generations, the objects and the responses
+cache = configured()
 
 if storage_t == "db":
     from models.engine.db_storage import DBStorage
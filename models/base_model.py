@@ -4,6 +4,7 @@ Contains class BaseModel
 """
 
 from datetime import datetime
+import json
 import models
 from os import getenv
 import sqlalchemy
@@ -13,6 +14,23 @@ import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
 
+
+def parse_time(string):
+    """returns the datetime written in the time format by format_time()
+
+    datetime.fromisoformat() parses that fixed layout an order of
+    magnitude faster than strptime(), which is kept for anything else so
+    that malformed values are still rejected the same way.
+    """
+    if len(string) == 26 and string[10] == "T" and string[19] == ".":
+        return datetime.fromisoformat(string)
+    return datetime.strptime(string, time)
+
+
+def format_time(value):
+    """returns value written in the time format, faster than strftime()"""
+    return value.isoformat(timespec="microseconds")
+
 if models.storage_t == "db":
     Base = declarative_base()
 else:
@@ -25,6 +43,10 @@ class BaseModel:
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
+    else:
+        # _cache holds [to_dict(), to_json() or None] until an attribute
+        # is assigned, in a slot so it stays out of __dict__
+        __slots__ = ("__dict__", "__weakref__", "_cache")
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
@@ -33,11 +55,11 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                self.created_at = parse_time(kwargs["created_at"])
             else:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                self.updated_at = parse_time(kwargs["updated_at"])
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
@@ -47,6 +69,15 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute, drops the cached to_dict() and lets the
+            storage re-index references"""
+            super().__setattr__(name, value)
+            object.__setattr__(self, "_cache", None)
+            if name[-3:] == "_id" or name == "amenity_ids":
+                models.storage.reindex(self, name)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
@@ -55,23 +86,46 @@ class BaseModel:
     def save(self):
         """updates the attribute 'updated_at' with the current datetime"""
         self.updated_at = datetime.utcnow()
+        if models.storage_t != "db":
+            # also catches in-place changes such as amenity_ids.append()
+            object.__setattr__(self, "_cache", None)
         models.storage.new(self)
         models.storage.save()
 
     def to_dict(self):
         """returns a dictionary containing all keys/values of the instance"""
+        cache = getattr(self, "_cache", None)
+        if cache is not None:
+            return cache[0].copy()
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = format_time(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
+            # relationships loaded along with the object
+            for key in self.__mapper__.relationships.keys():
+                new_dict.pop(key, None)
         if models.storage_t == "db" and 'password' in new_dict:
             del new_dict['password']
+        if models.storage_t != "db":
+            object.__setattr__(self, "_cache", [new_dict, None])
+            return new_dict.copy()
         return new_dict
 
+    def to_json(self):
+        """returns the JSON encoding of to_dict(), cached along with it"""
+        cache = getattr(self, "_cache", None)
+        if cache is None or cache[1] is None:
+            encoded = json.dumps(self.to_dict(), sort_keys=True)
+            cache = getattr(self, "_cache", None)
+            if cache is None:
+                return encoded
+            cache[1] = encoded
+        return cache[1]
+
     def delete(self):
         """delete the current instance from the storage"""
         models.storage.delete(self)
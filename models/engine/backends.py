@@ -0,0 +1,364 @@
+#!/usr/bin/python3
+"""
+Contains the cache backends shared by the storage engines and the API,
+selected by the HBNB_CACHE environment variable
+
+"memory", the default, keeps the cache in the process. "unix:PATH" keeps
+it in the cache server listening on the Unix socket PATH, shared by every
+worker of the API: as the storage generations live there too, a write
+in one worker invalidates what the others cached. While the server cannot
+be reached, or does not answer within HBNB_CACHE_TIMEOUT seconds, every
+lookup misses, with unknown generations, and every write to the cache is
+dropped, except for the counters bumped meanwhile, which are bumped once
+the server answers again: a restarted server starts empty, under a new
+token.
+
+usage: python3 -m models.engine.backends PATH
+runs a cache server listening on the Unix socket PATH
+"""
+
+from collections import OrderedDict
+import logging
+import marshal
+import os
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """cache held in the memory of the process
+
+    Values are bytes stored under string keys for a number of seconds, the
+    least recently used going first once the cache holds more than size
+    entries or max_bytes bytes. Counters, the storage generations, are kept
+    apart and never evicted.
+    """
+
+    # boolean - whether other processes see the same values and counters
+    shared = False
+
+    def __init__(self, size=10000, max_bytes=64 * 1024 * 1024):
+        """Instantiate an empty MemoryBackend"""
+        self.size = size
+        self.max_bytes = max_bytes
+        # string - tells the counters of this backend apart from the ones
+        # of another backend, or of a previous run, which started over
+        self.token = uuid.uuid4().hex[:8]
+        # OrderedDict - key -> (expiry time, value), least recently used
+        # first
+        self.values = OrderedDict()
+        self.counters = {}
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.lock = threading.Lock()
+
+    def lookup(self, keys, counters=()):
+        """returns the list of the values of keys, None for the missing
+        ones, and the list of the values of counters"""
+        now = time.monotonic()
+        values = []
+        with self.lock:
+            for key in keys:
+                entry = self.values.get(key)
+                if entry is not None and entry[0] <= now:
+                    self.expirations += 1
+                    self.__drop(key)
+                    entry = None
+                if entry is None:
+                    values.append(None)
+                else:
+                    self.values.move_to_end(key)
+                    values.append(entry[1])
+            return values, [self.counters.get(name, 0) for name in counters]
+
+    def store(self, key, value, ttl):
+        """stores the bytes value under key for ttl seconds"""
+        if len(value) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.values:
+                self.__drop(key)
+            self.values[key] = (time.monotonic() + ttl, value)
+            self.bytes += len(value)
+            while len(self.values) > self.size or \
+                    self.bytes > self.max_bytes:
+                self.evictions += 1
+                self.__drop(next(iter(self.values)))
+
+    def delete(self, keys):
+        """removes the values of keys"""
+        with self.lock:
+            for key in keys:
+                if key in self.values:
+                    self.__drop(key)
+
+    def bump(self, counters):
+        """increments counters"""
+        with self.lock:
+            for name in counters:
+                self.counters[name] = self.counters.get(name, 0) + 1
+
+    def clear(self):
+        """removes every value, the counters are kept"""
+        with self.lock:
+            self.values.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """returns the number of entries and bytes held, and the number of
+        entries evicted and expired"""
+        with self.lock:
+            return {"entries": len(self.values), "bytes": self.bytes,
+                    "evictions": self.evictions,
+                    "expirations": self.expirations}
+
+    def __drop(self, key):
+        """removes the entry key"""
+        self.bytes -= len(self.values.pop(key)[1])
+
+
+# length of a message, followed by the message encoded with marshal
+frame = struct.Struct("<I")
+# methods of MemoryBackend a client may call
+operations = ("lookup", "store", "delete", "bump", "clear", "stats", "token")
+
+
+def send(sock, message):
+    """sends message to sock"""
+    data = marshal.dumps(message)
+    sock.sendall(frame.pack(len(data)) + data)
+
+
+def receive(f):
+    """returns the next message read from the file object f, or None at
+    the end of the stream"""
+    header = f.read(frame.size)
+    if len(header) < frame.size:
+        return None
+    data = f.read(frame.unpack(header)[0])
+    return marshal.loads(data)
+
+
+class CacheHandler(socketserver.StreamRequestHandler):
+    """runs the calls of a client connection on the server's backend"""
+
+    def handle(self):
+        """answers the (operation, arguments) messages of the client"""
+        backend = self.server.backend
+        while True:
+            message = receive(self.rfile)
+            if message is None:
+                return
+            operation, args = message
+            if operation not in operations:
+                result = (False, "unknown operation " + str(operation))
+            elif operation == "token":
+                result = (True, backend.token)
+            else:
+                try:
+                    result = (True, getattr(backend, operation)(*args))
+                except Exception as e:
+                    result = (False, repr(e))
+            send(self.connection, result)
+
+
+class CacheServer(socketserver.ThreadingUnixStreamServer):
+    """serves a MemoryBackend to the SocketBackends of the API workers
+    over the Unix socket path, which only its owner may connect to
+
+    Messages are encoded with marshal, which must not read data from an
+    untrusted peer: keep the socket private to the user running the API.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, backend=None):
+        """Instantiate a CacheServer listening on path"""
+        if os.path.exists(path):
+            os.remove(path)
+        self.backend = backend or MemoryBackend(
+            int(os.getenv("HBNB_CACHE_SIZE", "10000")),
+            int(os.getenv("HBNB_CACHE_BYTES", str(64 * 1024 * 1024))))
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, CacheHandler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self):
+        """stops listening and removes the socket"""
+        super().server_close()
+        try:
+            os.remove(self.server_address)
+        except OSError:
+            pass
+
+
+class SocketBackend:
+    """client of a CacheServer, with the methods of MemoryBackend
+
+    Each thread of each process has its own connection, opened on first
+    use, so workers forked after a call do not share one. When the server
+    cannot be reached the calls fail soft: lookup() returns None for every
+    value and counter, token is None and the other calls do nothing, but
+    for bump(), whose counters are bumped when the server answers again.
+    """
+
+    shared = True
+    # float - seconds a call waits for the server before giving up
+    timeout = float(os.getenv("HBNB_CACHE_TIMEOUT", "0.5"))
+    # float - seconds the calls skip the server once it did not answer
+    retry_after = 1.0
+
+    def __init__(self, path):
+        """Instantiate a SocketBackend for the server listening on path"""
+        self.path = path
+        self.local = threading.local()
+        self.__token = None
+        self.down = False
+        # float - time.monotonic() before which the server is not tried
+        self.retry_at = 0
+        # set - counters whose bump did not reach the server
+        self.lost = set()
+        self.lock = threading.Lock()
+
+    def __connect(self):
+        """opens the connection of the thread to the server"""
+        local = self.local
+        if getattr(local, "sock", None) is not None:
+            local.sock.close()
+            local.sock = None
+        local.pid = None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        local.sock = sock
+        local.file = sock.makefile('rb')
+        local.pid = os.getpid()
+        # the server may have restarted, with new counters
+        self.__token = None
+
+    def __call(self, operation, *args, default=None):
+        """returns the result of operation run by the server, or default
+        if the server cannot be reached"""
+        local = self.local
+        if self.down and time.monotonic() < self.retry_at:
+            return self.__failed(operation, args, default)
+        # a connection opened before may have been closed by a restart of
+        # the server, a new one is tried once
+        for retry in (True, False):
+            try:
+                if getattr(local, "pid", None) != os.getpid():
+                    self.__connect()
+                    retry = False
+                if self.lost:
+                    with self.lock:
+                        lost = list(self.lost)
+                    self.__request("bump", lost)
+                    with self.lock:
+                        self.lost.difference_update(lost)
+                reply = self.__request(operation, *args)
+            except OSError as e:
+                local.pid = None
+                # a server that hangs is not waited for twice
+                if retry and not isinstance(e, socket.timeout):
+                    continue
+                if not self.down:
+                    logger.warning("cache server %s unreachable: %s",
+                                   self.path, e)
+                self.down = True
+                self.retry_at = time.monotonic() + self.retry_after
+                return self.__failed(operation, args, default)
+            break
+        if self.down:
+            self.down = False
+            logger.warning("cache server %s reachable again", self.path)
+        ok, result = reply
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+    def __request(self, operation, *args):
+        """returns the (ok, result) reply of the server to operation"""
+        send(self.local.sock, (operation, args))
+        reply = receive(self.local.file)
+        if reply is None:
+            raise ConnectionError("cache server closed the connection")
+        return reply
+
+    def __failed(self, operation, args, default):
+        """returns default for the call of operation that did not reach
+        the server, keeping the counters to bump once it is back"""
+        if operation == "bump":
+            with self.lock:
+                self.lost.update(args[0])
+        return default
+
+    @property
+    def token(self):
+        """the token of the server's backend, None if it is unreachable"""
+        if self.__token is None:
+            self.__token = self.__call("token")
+        return self.__token
+
+    def lookup(self, keys, counters=()):
+        """see MemoryBackend.lookup()"""
+        keys, counters = list(keys), list(counters)
+        return tuple(self.__call("lookup", keys, counters,
+                                 default=([None] * len(keys),
+                                          [None] * len(counters))))
+
+    def store(self, key, value, ttl):
+        """see MemoryBackend.store()"""
+        self.__call("store", key, value, ttl)
+
+    def delete(self, keys):
+        """see MemoryBackend.delete()"""
+        self.__call("delete", list(keys))
+
+    def bump(self, counters):
+        """see MemoryBackend.bump()"""
+        self.__call("bump", list(counters))
+
+    def clear(self):
+        """see MemoryBackend.clear()"""
+        self.__call("clear")
+
+    def stats(self):
+        """see MemoryBackend.stats()"""
+        return self.__call("stats", default={"available": False})
+
+
+def configured(spec=None):
+    """returns the backend described by spec, HBNB_CACHE by default"""
+    if spec is None:
+        spec = os.getenv("HBNB_CACHE", "memory")
+    if spec.startswith("unix:"):
+        return SocketBackend(spec[len("unix:"):])
+    if spec != "memory":
+        raise ValueError("unknown cache backend " + spec)
+    return MemoryBackend(int(os.getenv("HBNB_CACHE_SIZE", "10000")),
+                         int(os.getenv("HBNB_CACHE_BYTES",
+                                       str(64 * 1024 * 1024))))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python3 -m models.engine.backends PATH")
+    with CacheServer(sys.argv[1]) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
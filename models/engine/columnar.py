@@ -0,0 +1,217 @@
+#!/usr/bin/python3
+"""
+Contains the Table, Column and Row classes behind the compact FileStorage
+mode, which keeps the attributes of the objects read from the JSON file
+in per-class columns instead of one __dict__ per instance
+"""
+
+from array import array
+from datetime import datetime, timedelta
+from models.base_model import parse_time
+
+epoch = datetime(1970, 1, 1)
+microsecond = timedelta(microseconds=1)
+# marks a row that has no value for a column
+missing = object()
+
+
+class Table:
+    """columns holding the attributes of the objects of one class
+
+    ids are kept as 16 raw bytes, created_at and updated_at as microseconds
+    since the epoch and the *_id references as interned strings. Values
+    that do not fit their column, such as an id that is not a UUID, are
+    kept aside in extra.
+    """
+
+    def __init__(self, cls):
+        """Instantiate an empty Table for the model class cls"""
+        self.cls = cls
+        self.rows = 0
+        self.ids = bytearray()
+        self.created_at = array('q')
+        self.updated_at = array('q')
+        # dictionary - attribute -> list of the values of every row
+        self.columns = {}
+        # dictionary - (row, attribute) -> value that fits no column
+        self.extra = {}
+        # dictionary - single copy of every reference id string
+        self.interned = {}
+        self.row_class = type(cls.__name__ + "Row", (Row,),
+                              {"__slots__": (), "_table": self})
+
+    def append(self, attrs):
+        """adds a row holding the attributes of attrs, a dictionary read
+        from the JSON file, and returns the Row standing for it"""
+        row = self.rows
+        self.rows += 1
+        self.ids.extend(bytes(16))
+        self.created_at.append(0)
+        self.updated_at.append(0)
+        for name, value in attrs.items():
+            if name == "created_at" or name == "updated_at":
+                value = parse_time(value)
+            if name != "__class__":
+                self.set(row, name, value)
+        return self.row_class(row)
+
+    def get(self, row, name):
+        """returns the value of the attribute name of row"""
+        value = self.extra.get((row, name), missing)
+        if value is not missing:
+            return value
+        if name == "id":
+            h = self.ids[16 * row:16 * row + 16].hex()
+            return "{}-{}-{}-{}-{}".format(h[:8], h[8:12], h[12:16],
+                                           h[16:20], h[20:])
+        if name == "created_at" or name == "updated_at":
+            return epoch + getattr(self, name)[row] * microsecond
+        column = self.columns.get(name)
+        if column is not None and row < len(column):
+            value = column[row]
+        if value is missing:
+            raise AttributeError(name)
+        return value
+
+    def set(self, row, name, value):
+        """assigns value to the attribute name of row, missing unsets it"""
+        self.extra.pop((row, name), None)
+        if name == "id":
+            packed = pack_uuid(value)
+            if packed is None:
+                self.extra[(row, name)] = value
+            else:
+                self.ids[16 * row:16 * row + 16] = packed
+        elif name == "created_at" or name == "updated_at":
+            if type(value) is datetime and value.tzinfo is None:
+                getattr(self, name)[row] = (value - epoch) // microsecond
+            else:
+                self.extra[(row, name)] = value
+        else:
+            if name[-3:] == "_id" and type(value) is str:
+                value = self.interned.setdefault(value, value)
+            column = self.columns.setdefault(name, [])
+            if len(column) <= row:
+                column.extend([missing] * (self.rows - len(column)))
+            column[row] = value
+            if not hasattr(self.row_class, name):
+                setattr(self.row_class, name, Column(name))
+
+    def row_dict(self, row):
+        """returns a new dictionary of the attributes of row"""
+        attrs = {}
+        for name in ("id", "created_at", "updated_at"):
+            attrs[name] = self.get(row, name)
+        for name, column in self.columns.items():
+            value = self.extra.get((row, name), missing)
+            if value is missing and row < len(column):
+                value = column[row]
+            if value is not missing:
+                attrs[name] = value
+        return attrs
+
+
+def pack_uuid(value):
+    """returns the 16 bytes of the canonical UUID string value, or None"""
+    if type(value) is not str or len(value) != 36:
+        return None
+    try:
+        packed = bytes.fromhex(value.replace("-", ""))
+    except ValueError:
+        return None
+    h = packed.hex()
+    if value != "{}-{}-{}-{}-{}".format(h[:8], h[8:12], h[12:16],
+                                        h[16:20], h[20:]):
+        return None
+    return packed
+
+
+class Column:
+    """descriptor reading and writing one attribute of a Row in its Table"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        """Instantiate a Column for the attribute name"""
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """returns the value of the attribute in the Table"""
+        if obj is None:
+            return self
+        return obj._table.get(obj._row, self.name)
+
+    def __set__(self, obj, value):
+        """stores value in the Table"""
+        obj._table.set(obj._row, self.name, value)
+
+    def __delete__(self, obj):
+        """removes the value from the Table"""
+        obj._table.set(obj._row, self.name, missing)
+
+
+class Row:
+    """thin stand-in for a model instance whose attributes live in a Table
+
+    It passes isinstance() checks for its model class, and the model's
+    methods and properties run against it, so to_dict(), save(), delete(),
+    __str__() or State.cities behave as on a regular instance.
+    """
+
+    __slots__ = ("_row",)
+    id = Column("id")
+    created_at = Column("created_at")
+    updated_at = Column("updated_at")
+
+    def __init__(self, row):
+        """Instantiate the Row standing for the row-th row of its Table"""
+        object.__setattr__(self, "_row", row)
+
+    @property
+    def __class__(self):
+        """the model class of the row"""
+        return self._table.cls
+
+    @property
+    def __dict__(self):
+        """a new dictionary of the attributes of the row"""
+        return self._table.row_dict(self._row)
+
+    @property
+    def _cache(self):
+        """rows never cache to_dict(), to stay small"""
+        return None
+
+    @_cache.setter
+    def _cache(self, value):
+        """drops the cache BaseModel tries to keep"""
+        pass
+
+    def __getattr__(self, name):
+        """looks up the attributes the row has no value for on its model
+        class, binding methods and properties to the row, and giving it a
+        copy of the mutable defaults, such as Place.amenity_ids, as
+        __init__ gives each instance"""
+        for klass in self._table.cls.__mro__:
+            if name in klass.__dict__:
+                value = klass.__dict__[name]
+                if hasattr(value, "__get__"):
+                    return value.__get__(self, self._table.cls)
+                if type(value) in (list, dict, set):
+                    value = type(value)(value)
+                    self._table.set(self._row, name, value)
+                return value
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        """assigns through the model's __setattr__, so that User passwords
+        are still hashed and the storage still re-indexes references"""
+        if not hasattr(type(self), name):
+            setattr(type(self), name, Column(name))
+        self._table.cls.__setattr__(self, name, value)
+
+    def __str__(self):
+        """String representation of the model instance"""
+        return self._table.cls.__str__(self)
+
+    __repr__ = __str__
@@ -5,87 +5,561 @@ Contains the class DBStorage
 
 import models
 from models.amenity import Amenity
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, format_time, parse_time
 from models.city import City
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+import marshal
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import DateTime, and_, bindparam, create_engine, distinct
+from sqlalchemy import event, func
+from sqlalchemy import insert, literal, or_, select, text, union_all
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import aliased, configure_mappers, scoped_session
+from sqlalchemy.orm import make_transient_to_detached, selectinload
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.pool import QueuePool
+import threading
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+class TimedQueuePool(QueuePool):
+    """QueuePool recording how long checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a TimedQueuePool"""
+        super().__init__(*args, **kwargs)
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+        self.stats_lock = threading.Lock()
+
+    def _do_get(self):
+        """checks a connection out, timing the wait"""
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sqlalchemy.exc.TimeoutError:
+            with self.stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            with self.stats_lock:
+                self.waits += 1
+                self.wait_time += wait
+                self.max_wait = max(self.max_wait, wait)
+
+
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # integer - rows fetched at a time when iterating over unbounded pages
+    __yield_per = 1000
+    # integer - rows sent at a time by the inserts of bulk_save()
+    __bulk_size = 10000
+    # float - seconds get() keeps the objects it reads in models.cache, 0
+    # disables it
+    __object_ttl = 0
+    # dictionary - <class name> -> number of committed objects, kept up to
+    # date by the session events, or None until counted, see counts()
+    __counts = None
+    # dictionary - city id -> [state id, number of places], see
+    # place_counts()
+    __cities = None
+    # dictionary - <class name> -> generation at which __counts is exact,
+    # and None -> token of the cache backend
+    __counted = None
+    # float - time.monotonic() of the last count, and seconds after which
+    # the counts are counted again without a shared cache backend, 0 never
+    __counted_at = 0
+    __counts_ttl = 0
+    # integers - number of commits started or ended, and of commits
+    # running: a recount that overlaps one is not kept
+    __commits = 0
+    __running = 0
+    __counts_lock = threading.Lock()
 
     def __init__(self):
-        """Instantiate a DBStorage object"""
+        """Instantiate a DBStorage object
+
+        HBNB_MYSQL_URL replaces the MySQL URL, e.g. with a SQLite one for
+        tests. The connection pool is configured by HBNB_MYSQL_POOL_SIZE,
+        HBNB_MYSQL_MAX_OVERFLOW, HBNB_MYSQL_POOL_TIMEOUT (seconds to wait
+        for a connection), HBNB_MYSQL_POOL_RECYCLE (seconds after which a
+        connection is replaced, below the server's wait_timeout) and
+        HBNB_MYSQL_POOL_PRE_PING (0 disables testing connections before
+        using them). HBNB_CACHE_OBJECT_TTL sets the seconds get() keeps
+        objects in models.cache, HBNB_MYSQL_COUNTS_TTL the seconds after
+        which counts() counts again, see __live().
+        """
         HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
         HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+        HBNB_MYSQL_URL = getenv('HBNB_MYSQL_URL')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        if HBNB_MYSQL_URL is None:
+            HBNB_MYSQL_URL = 'mysql+mysqldb://{}:{}@{}/{}'.format(
+                HBNB_MYSQL_USER, HBNB_MYSQL_PWD, HBNB_MYSQL_HOST,
+                HBNB_MYSQL_DB)
+        url = make_url(HBNB_MYSQL_URL)
+        options = {
+            'pool_recycle': int(getenv('HBNB_MYSQL_POOL_RECYCLE', '3600')),
+            'pool_pre_ping': getenv('HBNB_MYSQL_POOL_PRE_PING', '1') != '0',
+        }
+        # an in-memory SQLite database lives in a single connection
+        if not (url.get_backend_name() == 'sqlite' and
+                url.database in (None, '', ':memory:')):
+            options['poolclass'] = TimedQueuePool
+            options['pool_size'] = int(getenv('HBNB_MYSQL_POOL_SIZE', '5'))
+            options['max_overflow'] = int(getenv('HBNB_MYSQL_MAX_OVERFLOW',
+                                                 '10'))
+            options['pool_timeout'] = float(getenv('HBNB_MYSQL_POOL_TIMEOUT',
+                                                   '30'))
+        self.__engine = create_engine(url, **options)
+        self.__object_ttl = float(getenv('HBNB_CACHE_OBJECT_TTL', '0'))
+        self.__counts_ttl = float(getenv('HBNB_MYSQL_COUNTS_TTL', '0'))
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, load=()):
+        """query on the current database session
+
+        load lists the relationships of cls to fetch along, as dotted
+        paths such as "cities" or "cities.places", with one query per
+        relationship instead of one per object.
+        """
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
-                for obj in objs:
+                query = self.__session.query(classes[clss])
+                if cls is not None:
+                    query = query.options(*self.__loaders(classes[clss],
+                                                          load))
+                for obj in query.all():
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
-    
-    def get(self, cls, id):
-        """Retrieve an object by class and ID"""
+
+    def get(self, cls, id, load=()):
+        """Retrieve an object by class and ID, and the relationships listed
+        in load as in all()"""
         if cls is not None and id is not None:
-            return self.__session.query(cls).get(id)
+            cls = classes.get(cls, cls)
+            if self.__object_ttl and not load:
+                return self.__cached(cls, id)
+            return self.__session.get(cls, id,
+                                      options=self.__loaders(cls, load))
         return None
 
+    def __cached(self, cls, id):
+        """returns get(cls, id) from models.cache when it holds the columns
+        of the object read at the current generation of cls, else from the
+        database, storing its columns in models.cache"""
+        session = self.__session
+        obj = session.identity_map.get(identity_key(cls, id))
+        if obj is not None:
+            return obj
+        name = cls.__name__
+        key = "object:" + name + "." + id
+        (value,), (generation,) = models.cache.lookup((key,), (name,))
+        columns = sqlalchemy.inspect(cls).column_attrs
+        if value is not None:
+            read_at, row = marshal.loads(value)
+            if read_at == generation:
+                obj = cls.__mapper__.class_manager.new_instance()
+                for attr in columns:
+                    value = row[attr.key]
+                    if value is not None and \
+                            isinstance(attr.columns[0].type, DateTime):
+                        value = parse_time(value)
+                    set_committed_value(obj, attr.key, value)
+                # persistent in the session, as if just loaded
+                make_transient_to_detached(obj)
+                session.add(obj)
+                return obj
+        obj = session.get(cls, id)
+        # the generation is unknown while the cache server is unreachable
+        if obj is not None and generation is not None:
+            row = {}
+            for attr in columns:
+                value = getattr(obj, attr.key)
+                if value is not None and \
+                        isinstance(attr.columns[0].type, DateTime):
+                    value = format_time(value)
+                row[attr.key] = value
+            models.cache.store(key, marshal.dumps((generation, row)),
+                               self.__object_ttl)
+        return obj
+
     def count(self, cls=None):
         """Count the number of objects in storage"""
         if cls is None:
-            count = 0
-            for clss in classes.values():
-                count += self.__session.query(clss).count()
-            return count
+            return sum(self.counts().values())
         return self.__session.query(cls).count()
 
+    def counts(self, approximate=False):
+        """returns the {class name: number of objects} of every class
+
+        The counts are kept up to date by the session events of the
+        commits of this process, and counted again, with a single UNION
+        ALL query, when the class generations show writes made elsewhere.
+        approximate reads instead the row estimates MySQL keeps in
+        information_schema. Other databases are counted exactly.
+        """
+        if approximate and self.__engine.dialect.name == 'mysql':
+            counts = dict.fromkeys(classes, 0)
+            names = {clss.__tablename__: name
+                     for name, clss in classes.items()}
+            query = text("SELECT table_name, table_rows "
+                         "FROM information_schema.tables "
+                         "WHERE table_schema = DATABASE() "
+                         "AND table_name IN :names").bindparams(
+                             bindparam('names', list(names), expanding=True))
+            for table, rows in self.__session.execute(query):
+                counts[names[table]] = rows or 0
+            return counts
+        return self.__live()[0]
+
+    def place_counts(self):
+        """returns the number of places of each city and of each state, as
+        {"cities": {city id: count}, "states": {state id: count}}, kept up
+        to date along with counts(); cities and states without places are
+        left out"""
+        cities = self.__live(detailed=True)[1]
+        states = {}
+        for state_id, count in cities.values():
+            if count:
+                states[state_id] = states.get(state_id, 0) + count
+        return {"cities": {id: count for id, (state_id, count)
+                           in cities.items() if count},
+                "states": states}
+
+    def __live(self, detailed=False):
+        """returns a copy of __counts and, if detailed, of __cities,
+        counting them again first if they are not exact anymore
+
+        The counts follow the commits of this process, and the writes of
+        the other ones through the generations of a shared cache backend.
+        With any other backend, HBNB_MYSQL_COUNTS_TTL has them counted
+        again once they are that many seconds old."""
+        names = list(classes)
+        generations = dict(zip(names, self.class_generations(names)))
+        # a restarted cache server counts its generations from 0 again
+        generations[None] = models.cache.token
+        expired = not getattr(models.cache, "shared", False) and \
+            self.__counts_ttl and \
+            time.monotonic() - self.__counted_at >= self.__counts_ttl
+        with self.__counts_lock:
+            if self.__counts is not None and not expired and \
+                    self.__counted == generations:
+                return (dict(self.__counts),
+                        {id: tuple(city) for id, city
+                         in self.__cities.items()} if detailed else None)
+            commits = self.__commits
+            running = self.__running
+        # on a connection of its own, which only sees committed rows
+        with self.__engine.connect() as conn:
+            counts = dict.fromkeys(classes, 0)
+            counts.update(conn.execute(union_all(
+                *[select(literal(name), func.count()).select_from(clss)
+                  for name, clss in classes.items()])).all())
+            cities = {id: [state_id, count]
+                      for id, state_id, count in conn.execute(
+                          select(City.id, City.state_id, func.count(Place.id))
+                          .outerjoin(Place, Place.city_id == City.id)
+                          .group_by(City.id, City.state_id))}
+        with self.__counts_lock:
+            if self.__commits == commits and not running and \
+                    None not in generations.values():
+                DBStorage.__counts = dict(counts)
+                DBStorage.__cities = {id: list(city)
+                                      for id, city in cities.items()}
+                DBStorage.__counted = generations
+                DBStorage.__counted_at = time.monotonic()
+        return (counts, {id: tuple(city) for id, city in cities.items()}
+                if detailed else None)
+
+    @staticmethod
+    def __tally(pending, name, values, sign):
+        """adds to the changes pending the object of class name whose
+        column values are the mapping values, or removes it if sign is
+        -1"""
+        counts, cities, places = pending
+        counts[name] = counts.get(name, 0) + sign
+        if name == "City":
+            cities[values["id"]] = values.get("state_id") if sign > 0 \
+                else None
+        elif name == "Place":
+            city_id = values.get("city_id")
+            places[city_id] = places.get(city_id, 0) + sign
+
+    def __flushed(self, session, context):
+        """records the objects a flush inserted, deleted or moved to
+        another city or state, applied to __counts once committed"""
+        pending = session.info.setdefault("counts", ({}, {}, {}))
+        for obj in session.new:
+            self.__tally(pending, type(obj).__name__, obj.__dict__, 1)
+        for obj in session.deleted:
+            self.__tally(pending, type(obj).__name__, obj.__dict__, -1)
+        for obj in session.dirty:
+            if isinstance(obj, City):
+                if sqlalchemy.inspect(obj).attrs.state_id.history.added:
+                    pending[1][obj.id] = obj.state_id
+            elif isinstance(obj, Place):
+                history = sqlalchemy.inspect(obj).attrs.city_id.history
+                if history.added:
+                    for city_id in history.deleted:
+                        pending[2][city_id] = pending[2].get(city_id, 0) - 1
+                    pending[2][obj.city_id] = \
+                        pending[2].get(obj.city_id, 0) + 1
+
+    def __committing(self, session):
+        """records that a commit started"""
+        with self.__counts_lock:
+            session.info["committing"] = True
+            DBStorage.__commits += 1
+            DBStorage.__running += 1
+
+    def __ended(self, session):
+        """records that the commit of session, if any, ended"""
+        if session.info.pop("committing", False):
+            DBStorage.__commits += 1
+            DBStorage.__running -= 1
+
+    def __committed(self, session):
+        """applies the changes of the committed transaction to __counts"""
+        pending = session.info.pop("counts", None)
+        with self.__counts_lock:
+            self.__ended(session)
+            if pending is None or self.__counts is None:
+                return
+            counts, cities, places = pending
+            for name, delta in counts.items():
+                self.__counts[name] += delta
+            for id, state_id in cities.items():
+                if state_id is not None:
+                    self.__cities.setdefault(id, [state_id, 0])[0] = \
+                        state_id
+            for id, delta in places.items():
+                self.__cities.setdefault(id, [None, 0])[1] += delta
+            for id, state_id in cities.items():
+                if state_id is None:
+                    self.__cities.pop(id, None)
+
+    def __rolled_back(self, session):
+        """forgets the changes of the transaction rolled back"""
+        session.info.pop("counts", None)
+        with self.__counts_lock:
+            self.__ended(session)
+
+    def page(self, cls, limit=None, after=None, attr=None, id=None):
+        """returns up to limit objects of class cls ordered by (created_at,
+        id) and coming after the (created_at, id) tuple after
+
+        attr and id restrict the page to the objects whose attr equals id.
+        Without a limit the rows are streamed from a server-side cursor.
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        query = self.__session.query(cls)
+        if attr is not None:
+            query = query.filter(getattr(cls, attr) == id)
+        return self.__page(query, cls, limit, after)
+
+    def search_places(self, states=(), cities=(), amenities=(), limit=None,
+                      after=None):
+        """returns the places matching the ids of states, cities and
+        amenities as models.engine.search.search_places() does, paged as
+        in page(), with a single query
+
+        The places are those of the listed cities and of the cities of the
+        listed states, or every place when there are none, having all the
+        listed amenities: their place_amenity rows are grouped by place and
+        counted against the number of existing amenities.
+        """
+        query = self.__session.query(Place)
+        if states or cities:
+            city_ids = select(City.id).where(or_(City.state_id.in_(states),
+                                                 City.id.in_(cities)))
+            other = aliased(Place)
+            query = query.filter(or_(
+                Place.city_id.in_(city_ids),
+                ~select(other.id).where(other.city_id.in_(city_ids))
+                .exists()))
+        if amenities:
+            link = Place.amenities.property.secondary
+            known = select(Amenity.id).where(Amenity.id.in_(amenities))
+            having_all = (select(link.c.place_id)
+                          .join(Amenity, Amenity.id == link.c.amenity_id)
+                          .where(link.c.amenity_id.in_(amenities))
+                          .group_by(link.c.place_id)
+                          .having(func.count(distinct(link.c.amenity_id)) ==
+                                  select(func.count())
+                                  .select_from(known.subquery())
+                                  .scalar_subquery()))
+            query = query.filter(or_(Place.id.in_(having_all),
+                                     ~known.exists()))
+        return self.__page(query, Place, limit, after)
+
+    def __page(self, query, cls, limit, after):
+        """returns up to limit objects of query on cls ordered by
+        (created_at, id) and coming after the tuple after"""
+        if after is not None:
+            query = query.filter(or_(cls.created_at > after[0],
+                                     and_(cls.created_at == after[0],
+                                          cls.id > after[1])))
+        query = query.order_by(cls.created_at, cls.id)
+        if limit is None:
+            # server-side cursor, rows are fetched as they are consumed
+            return query.yield_per(self.__yield_per)
+        return query.limit(limit).all()
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
+        self.__bump(type(obj))
+
+    def bulk_new(self, objs):
+        """queues objs to be inserted by the next save() with one
+        executemany() per class, bypassing the session's unit of work
+
+        Only their columns are written: relationships such as
+        Place.amenities have to be set up with new().
+        """
+        pending = self.__session.info.setdefault("bulk", {})
+        for obj in objs:
+            if obj is None:
+                continue
+            row = {}
+            for attr in sqlalchemy.inspect(type(obj)).column_attrs:
+                value = getattr(obj, attr.key)
+                if value is not None:
+                    row[attr.key] = value
+            pending.setdefault(type(obj), []).append(row)
+        self.__bump(*pending)
+
+    def bulk_save(self):
+        """writes the objects passed to bulk_new() at once, see save()"""
+        self.save()
 
     def save(self):
-        """commit all changes of the current database session"""
+        """commit all changes of the current database session, inserting
+        first the objects queued by bulk_new()"""
+        pending = self.__session.info.pop("bulk", {})
+        changed = {type(obj) for objs in (self.__session.new,
+                                          self.__session.dirty,
+                                          self.__session.deleted)
+                   for obj in objs}
+        changed.update(pending)
+        # parents first, for the foreign keys
+        tables = Base.metadata.sorted_tables
+        for cls in sorted(pending, key=lambda c: tables.index(c.__table__)):
+            rows = pending[cls]
+            counted = self.__session.info.setdefault("counts", ({}, {}, {}))
+            for row in rows:
+                self.__tally(counted, cls.__name__, row, 1)
+            for i in range(0, len(rows), self.__bulk_size):
+                self.__session.execute(insert(cls),
+                                       rows[i:i + self.__bulk_size])
         self.__session.commit()
+        # once committed, so that a generation never goes with older rows
+        self.__bump(*changed)
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
             self.__session.delete(obj)
+            self.__bump(type(obj))
 
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
+        # sets up the backrefs, such as Amenity.place_amenities
+        configure_mappers()
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        # keep counts() up to date
+        event.listen(sess_factory, "after_flush", self.__flushed)
+        event.listen(sess_factory, "before_commit", self.__committing)
+        event.listen(sess_factory, "after_commit", self.__committed)
+        event.listen(sess_factory, "after_rollback", self.__rolled_back)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
+
+    @staticmethod
+    def __loaders(cls, load):
+        """returns the selectinload() options loading the dotted
+        relationship paths of load from cls"""
+        options = []
+        for path in load:
+            option = None
+            owner = cls
+            for name in path.split("."):
+                attr = getattr(owner, name)
+                if option is None:
+                    option = selectinload(attr)
+                else:
+                    option = option.selectinload(attr)
+                owner = attr.property.mapper.class_
+            options.append(option)
+        return options
+
+    def class_generation(self, cls):
+        """returns a number that changes every time objects of class cls
+        are passed to new() or delete() or saved, kept by models.cache so
+        that it follows the writes of every process sharing the cache"""
+        return self.class_generations((cls,))[0]
+
+    def tracks_writes(self):
+        """tells whether the class generations change with the writes of
+        every process, which only a cache backend they share sees"""
+        return getattr(models.cache, "shared", False)
+
+    def class_generations(self, clss):
+        """returns the tuple of the class_generation() of each class of
+        clss, read at once"""
+        names = [cls if isinstance(cls, str) else cls.__name__
+                 for cls in clss]
+        return tuple(models.cache.lookup((), names)[1])
+
+    def __bump(self, *classes):
+        """records that objects of classes changed"""
+        if classes:
+            models.cache.bump([cls.__name__ for cls in classes])
+            with self.__counts_lock:
+                # the counts stay exact through the writes of this process
+                if self.__counted is not None:
+                    for cls in classes:
+                        self.__counted[cls.__name__] += 1
+
+    def pool_status(self):
+        """returns the metrics of the connection pool: its size, the
+        connections checked out and in, the overflow beyond the size, and
+        the number, total and longest wait in seconds of the checkouts"""
+        pool = self.__engine.pool
+        status = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            status.update(size=pool.size(), checked_out=pool.checkedout(),
+                          checked_in=pool.checkedin(),
+                          overflow=max(pool.overflow(), 0))
+        if isinstance(pool, TimedQueuePool):
+            with pool.stats_lock:
+                status.update(waits=pool.waits, wait_time=pool.wait_time,
+                              max_wait=pool.max_wait,
+                              timeouts=pool.timeouts)
+        return status
@@ -3,10 +3,21 @@
 Contains the FileStorage class
 """
 
-import json
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import wraps
+import models
+import os
+import threading
+import time
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, parse_time
 from models.city import City
+from models.engine.columnar import Table
+from models.engine.journal import Journal
+from models.engine.search import search_places
+from models.engine.serializers import formats
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -14,70 +25,681 @@ from models.user import User
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# attributes that refer to other objects, reverse indexed per class
+references = {"City": ("state_id",),
+              "Place": ("city_id", "user_id", "amenity_ids"),
+              "Review": ("place_id", "user_id")}
+reference_attrs = {attr for attrs in references.values() for attr in attrs}
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def synchronized(method):
+    """makes method hold the lock of the storage while it runs"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        """calls method holding the lock"""
+        with self.locked():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
-    # string - path to the JSON file
-    __file_path = "file.json"
+    # serializer - writes and reads the snapshot, JSON by default or
+    # binary when HBNB_FILE_FORMAT is "binary"
+    __serializer = formats.get(os.getenv("HBNB_FILE_FORMAT"), formats["json"])
+    # string - path to the snapshot file
+    __file_path = __serializer.path
     # dictionary - empty but will store all objects by <class name>.id
+    # in lazy mode an object is stored as its raw dictionary until used
     __objects = {}
+    # string - how reload() stores the objects it reads: "eager" as model
+    # instances, "lazy" as dictionaries instantiated when first accessed,
+    # "compact" as Rows of per-class columnar Tables, "mmap" leaves them in
+    # the binary snapshot mapped in memory until they are accessed
+    __load_mode = os.getenv("HBNB_FILE_LOAD", "eager")
+    # Snapshot - the binary snapshot mapped in mmap mode, or None
+    __snapshot = None
+    # dictionary - <class name> -> {<class name>.id} keys of __snapshot
+    # already loaded into __objects, replaced or deleted
+    __resolved = {}
+    # dictionary - objects passed to new() since the last save, or None
+    # for the ones passed to delete()
+    __dirty = {}
+    # integer - journal length that triggers a compaction, 0 disables it
+    __journal_max = int(os.getenv("HBNB_FILE_JOURNAL", "0"))
+    # Journal - changes appended since __file_path was last written
+    __journal = Journal(__file_path + ".journal")
+    # dictionary - <class name> -> {<class name>.id: obj}, a bucket per
+    # class kept alongside __objects so all(cls) and count(cls) need no scan
+    __by_class = {}
+    # dictionary - (<class name>, attribute) -> referenced id ->
+    # {<class name>.id: None}, reverse index of each reference attribute
+    __refs = {}
+    # dictionary - <class name>.id -> (ids, ...) the values of the
+    # reference attributes each object was indexed under
+    __links = {}
+    # dictionary - <class name> -> [(created_at, id)] sorted, built by the
+    # first page() over the class then kept up to date
+    __order = {}
+    # dictionary - the __objects the buckets were built from
+    __indexed = None
+    # tuple - (mtime, size, inode) of __file_path and of the journal when
+    # they were last synced
+    __stamp = None
+    # integer - bumped every time __objects is synced with __file_path
+    __generation = 0
+    # dictionary - <class name> -> signature of its objects in the file
+    # at the last reload, see __signatures_of()
+    __signatures = None
+    # string - "changed" only reloads on close() if the file changed on disk
+    __reload_mode = os.getenv("HBNB_FILE_RELOAD", "changed")
+    # RLock - serializes the threads using the storage
+    __lock = threading.RLock()
+    # file - <__file_path>.lock while this process holds an advisory lock
+    # on it, "read" (shared) or "write" (exclusive) as __lock_access
+    __lock_file = None
+    __lock_access = None
+    # float - seconds save() waits for other threads to join its group
+    # commit, HBNB_FILE_GROUP_COMMIT milliseconds, 0 saves right away
+    __commit_window = float(os.getenv("HBNB_FILE_GROUP_COMMIT", "0")) / 1000
+    # Future - the group commit the next save() joins, or None
+    __batch = None
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    @synchronized
+    def all(self, cls=None, load=()):
+        """returns the dictionary __objects, or the objects of class cls
+
+        load, the relationships DBStorage should fetch along, is ignored as
+        they are indexed in memory.
+        """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            return {key: self.__load(key) for key in self.__bucket(cls)}
+        if self.__snapshot is not None:
+            for name in self.__snapshot.sections:
+                self.__map_in(name)
+        if self.__load_mode == "lazy":
+            for key in self.__objects:
+                self.__load(key)
         return self.__objects
-    
-    def get(self, cls, id):
-        """Retrieve an object by class and ID"""
+
+    @synchronized
+    def get(self, cls, id, load=()):
+        """Retrieve an object by class and ID
+
+        In mmap mode only the object's block of the snapshot is decoded.
+        load is ignored as in all().
+        """
         if cls is not None and id is not None:
-            key = cls.__name__ + '.' + id
-            return self.__objects.get(key)
+            name = self.__class_name(cls)
+            key = name + '.' + id
+            if key in self.__buckets().get(name, {}):
+                return self.__load(key)
+            obj = self.__unmapped(key)
+            if obj is not None:
+                obj = classes[name](**obj)
+                self.__put(key, obj)
+                return obj
         return None
-    
+
+    @synchronized
     def count(self, cls=None):
         """Count the number of objects in storage"""
         if cls is None:
-            return len(self.__objects)
-        return len(self.all(cls))
+            names = self.__snapshot.sections if self.__snapshot else ()
+            return len(self.__objects) + sum(map(self.__unmapped_count,
+                                                 names))
+        name = self.__class_name(cls)
+        return len(self.__buckets().get(name, {})) + \
+            self.__unmapped_count(name)
+
+    @synchronized
+    def counts(self, approximate=False):
+        """returns the {class name: number of objects} of every class
 
+        The counts are the sizes of the class buckets, kept up to date by
+        new(), delete() and reload(). They are always exact, approximate
+        is there for DBStorage.
+        """
+        return {name: self.count(name) for name in classes}
+
+    @synchronized
+    def place_counts(self):
+        """returns the number of places of each city and of each state, see
+        DBStorage.place_counts(), from the reverse indexes of city_id and
+        state_id kept up to date with the objects"""
+        cities = self.__bucket("City")
+        self.__bucket("Place")
+        places = {id: len(group) for id, group
+                  in self.__refs.get(("Place", "city_id"), {}).items()
+                  if "City." + str(id) in cities}
+        states = {}
+        for id, group in self.__refs.get(("City", "state_id"), {}).items():
+            count = sum(places.get(key.partition(".")[2], 0)
+                        for key in group)
+            if count:
+                states[id] = count
+        return {"cities": places, "states": states}
+
+    @synchronized
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            self.__unmapped(key)
+            self.__put(key, obj)
+            self.__dirty[key] = obj
+            self.__bump(obj.__class__.__name__)
+
+    @synchronized
+    def bulk_new(self, objs):
+        """sets in __objects every object of objs as new() does, dropping
+        the (created_at, id) order of their classes, rebuilt by the next
+        page(), rather than inserting in it one object at a time"""
+        names = set()
+        for obj in objs:
+            if obj is not None:
+                name = obj.__class__.__name__
+                self.__order.pop(name, None)
+                key = name + "." + obj.id
+                self.__unmapped(key)
+                self.__put(key, obj)
+                self.__dirty[key] = obj
+                names.add(name)
+        self.__bump(*names)
+
+    def bulk_save(self):
+        """writes the objects passed to bulk_new() at once, see save()"""
+        self.save()
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path)
+
+        In journal mode only the objects passed to new() or delete() since
+        the last save are appended to the journal, which is folded back
+        into the JSON file once it holds HBNB_FILE_JOURNAL records.
+
+        The file is locked for writing meanwhile, and the objects other
+        processes saved since the last sync are reloaded first, with the
+        changes made here applied on top of them.
+
+        In group commit mode the first thread to save waits for the
+        commit window, then saves the changes of every thread that called
+        save() meanwhile at once; each of them returns once it is done.
+        """
+        if not self.__commit_window:
+            self.__commit()
+            return
+        with self.locked():
+            batch = self.__batch
+            leader = batch is None
+            if leader:
+                batch = FileStorage.__batch = Future()
+        if leader:
+            time.sleep(self.__commit_window)
+            with self.locked():
+                FileStorage.__batch = None
+                try:
+                    self.__commit()
+                except BaseException as e:
+                    batch.set_exception(e)
+                else:
+                    batch.set_result(None)
+        batch.result()
+
+    def __commit(self):
+        """writes the changes, see save()"""
+        with self.locked("write"):
+            self.__bump(*{key.partition(".")[0] for key in self.__dirty})
+            if self.changed():
+                self.__merge()
+            if self.__journal_max and os.path.exists(self.__file_path):
+                changes = {}
+                for key, obj in self.__dirty.items():
+                    changes[key] = obj.to_dict() if obj is not None else None
+                self.__journal.append(changes)
+                self.__dirty.clear()
+                if len(self.__journal) < self.__journal_max:
+                    self.__synced()
+                    return
+            self.compact()
+
+    def compact(self):
+        """writes all of __objects to the snapshot and clears the journal
+
+        The snapshot is written to a temporary file which then replaces it,
+        so readers never see it half-written. In mmap mode it is mapped
+        again afterwards, so that the objects it holds no longer need to be
+        kept in __objects.
+        """
+        with self.locked("write"):
+            snapshot = self.__snapshot
+            if snapshot is not None:
+                self.all()
+                FileStorage.__snapshot = None
+                snapshot.close()
+            self.__serializer.dump(self.__file_path, self.__objects.items())
+            self.__journal.clear()
+            self.__dirty.clear()
+            self.__synced()
+            if snapshot is not None:
+                self.reload()
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
-        try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
+        """deserializes the snapshot and its journal to __objects
+
+        The objects no longer in the snapshot are dropped, unless they were
+        passed to new() since the last save. In lazy mode the objects are
+        only parsed, and instantiated by the first all(), get(), related()
+        or page() that returns them. In compact mode they are stored in
+        columnar Tables. In mmap mode, with the binary format, the snapshot
+        is mapped in memory instead of read, and only the journal is loaded
+        into __objects.
+        """
+        with self.locked("read"):
+            tables = {}
+            jo = {}
+            # unchanged since this process last read or wrote it
+            unchanged = self.__signatures is not None and not self.changed()
+            if self.__snapshot is not None:
+                self.__snapshot.close()
+                FileStorage.__snapshot = None
+            FileStorage.__resolved = {}
+            exists = os.path.exists(self.__file_path)
+            if exists and self.__load_mode == "mmap" and \
+                    hasattr(self.__serializer, "open"):
+                self.__objects.clear()
+                FileStorage.__snapshot = self.__serializer.open(
+                    self.__file_path)
+            elif exists:
+                jo = self.__serializer.load(self.__file_path)
+            for key, value in self.__journal.replay():
+                jo[key] = value
+            # the classes of the changes not saved yet that the file
+            # overrides, and the ones whose objects changed on disk
+            signatures = self.__signatures_of(jo)
+            previous = self.__signatures
+            changed = {key.partition(".")[0] for key in self.__dirty
+                       if key in jo}
+            if previous is None or (self.__snapshot is not None and
+                                    self.__stamp[0] !=
+                                    self.__file_stamp()[0]):
+                changed.update(classes)
+            elif not unchanged:
+                changed.update(name for name in set(signatures) |
+                               set(previous)
+                               if signatures.get(name) != previous.get(name))
+            FileStorage.__signatures = signatures
+            if exists and self.__snapshot is None:
+                for key in list(self.__objects):
+                    if key not in jo and key not in self.__dirty:
+                        self.__pop(key)
             for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
-            pass
+                self.__dirty.pop(key, None)
+                self.__unmapped(key)
+                if jo[key] is None:
+                    self.__pop(key)
+                elif self.__load_mode in ("eager", "mmap") or \
+                        "id" not in jo[key] or \
+                        "created_at" not in jo[key] or \
+                        "updated_at" not in jo[key]:
+                    self.__put(key, classes[jo[key]["__class__"]](**jo[key]))
+                elif self.__load_mode == "lazy":
+                    self.__put(key, jo[key])
+                else:
+                    name = jo[key]["__class__"]
+                    if name not in tables:
+                        tables[name] = Table(classes[name])
+                    self.__put(key, tables[name].append(jo[key]))
+            if self.__snapshot is not None:
+                # keep the changes not saved yet
+                for key, obj in self.__dirty.items():
+                    self.__unmapped(key)
+                    if obj is None:
+                        self.__pop(key)
+                    else:
+                        self.__put(key, obj)
+            self.__bump(*changed)
+            self.__synced()
 
+    @synchronized
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            if key in self.__objects or self.__unmapped(key) is not None:
+                self.__pop(key)
+                self.__dirty[key] = None
+                self.__bump(obj.__class__.__name__)
 
+    @synchronized
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
+        """call reload() if the JSON file changed since the last sync"""
+        if self.__reload_mode == "always" or self.changed():
+            self.reload()
+
+    def changed(self):
+        """tells whether __file_path was modified since the last sync"""
+        return self.__file_stamp() != self.__stamp
+
+    @contextmanager
+    def locked(self, access=None):
+        """holds the lock of the storage, and with access "read" or "write"
+        a shared or exclusive advisory lock on <__file_path>.lock, which
+        serializes the processes sharing the file"""
+        with self.__lock:
+            held = self.__lock_access
+            if access is None or fcntl is None or held == "write" or \
+                    held == access:
+                yield
+                return
+            f = self.__lock_file or open(self.__file_path + ".lock", 'a')
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if access == "write"
+                        else fcntl.LOCK_SH)
+            FileStorage.__lock_file = f
+            FileStorage.__lock_access = access
+            try:
+                yield
+            finally:
+                if held is None:
+                    FileStorage.__lock_file = None
+                    FileStorage.__lock_access = None
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                    f.close()
+                else:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+                    FileStorage.__lock_access = held
+
+    @property
+    def generation(self):
+        """number of times __objects was synced with the JSON file"""
+        return self.__generation
+
+    def class_generation(self, cls):
+        """returns a number that changes every time objects of class cls
+        are passed to new() or delete(), saved, or changed by a reload(),
+        kept by models.cache so that it follows every process sharing the
+        cache"""
+        return self.class_generations((cls,))[0]
+
+    def tracks_writes(self):
+        """tells whether the class generations change with the writes of
+        every process, which reload() reads back from the file"""
+        return True
+
+    @staticmethod
+    def __signatures_of(jo):
+        """returns the {<class name>: (count, sum)} of the objects of jo,
+        sum being that of the hashes of their keys and updated_at, which
+        changes when an object is added, removed or saved again"""
+        signatures = {}
+        for key, value in jo.items():
+            if value is not None:
+                name = key.partition(".")[0]
+                count, total = signatures.get(name, (0, 0))
+                signatures[name] = (count + 1, total +
+                                    hash((key, value.get("updated_at"))))
+        return signatures
+
+    def class_generations(self, clss):
+        """returns the tuple of the class_generation() of each class of
+        clss, read at once"""
+        names = [self.__class_name(cls) for cls in clss]
+        return tuple(models.cache.lookup((), names)[1])
+
+    def __bump(self, *names):
+        """records that objects of the classes names changed"""
+        if names:
+            models.cache.bump(names)
+
+    @synchronized
+    def related(self, cls, attr, id):
+        """returns the objects of class cls whose attribute attr refers to
+        id, e.g. related(City, "state_id", state.id) for a state's cities"""
+        name = self.__class_name(cls)
+        if attr not in references.get(name, ()):
+            return [obj for obj in self.all(name).values()
+                    if getattr(obj, attr, None) == id]
+        self.__bucket(name)
+        group = self.__refs.get((name, attr), {}).get(id, {})
+        return [self.__load(key) for key in list(group)]
+
+    @synchronized
+    def page(self, cls, limit=None, after=None, attr=None, id=None):
+        """returns up to limit objects of class cls ordered by (created_at,
+        id) and coming after the (created_at, id) tuple after
+
+        attr and id restrict the page to the objects related(cls, attr, id)
+        """
+        name = self.__class_name(cls)
+        if attr is not None:
+            order = sorted((obj.created_at, obj.id)
+                           for obj in self.related(name, attr, id))
+        else:
+            order = self.__order.get(name)
+            if order is None:
+                order = sorted(self.__entry(obj)
+                               for obj in self.__bucket(name).values())
+                FileStorage.__order[name] = order
+        start = bisect_right(order, after) if after is not None else 0
+        end = len(order) if limit is None else start + limit
+        return [self.__load(name + "." + entry[1])
+                for entry in order[start:end]]
+
+    @synchronized
+    def search_places(self, states=(), cities=(), amenities=(), limit=None,
+                      after=None):
+        """returns the places matching the ids of states, cities and
+        amenities, see models.engine.search.search_places(), ordered and
+        paged as in page() when limit or after are given"""
+        places = search_places(self, states, cities, amenities)
+        if limit is None and after is None:
+            return places
+        order = sorted(places, key=self.__entry)
+        start = 0
+        if after is not None:
+            start = bisect_right([self.__entry(obj) for obj in order], after)
+        end = len(order) if limit is None else start + limit
+        return order[start:end]
+
+    @synchronized
+    def reindex(self, obj, attr):
+        """refreshes the reverse indexes of obj after attr was assigned"""
+        if attr not in reference_attrs or getattr(obj, "id", None) is None:
+            return
+        key = obj.__class__.__name__ + "." + obj.id
+        if self.__objects.get(key) is obj:
+            self.__put(key, obj)
+
+    def __merge(self):
+        """reloads what other processes saved, then applies again the
+        changes made here since the last save"""
+        pending = dict(self.__dirty)
         self.reload()
+        for key, obj in pending.items():
+            self.__unmapped(key)
+            if obj is None:
+                self.__pop(key)
+            else:
+                self.__put(key, obj)
+        self.__dirty.update(pending)
+
+    @staticmethod
+    def __class_name(cls):
+        """returns the name of cls, which may be a class or its name"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    @staticmethod
+    def __name_of(obj):
+        """returns the class name of obj, which may be a raw dictionary"""
+        if type(obj) is dict:
+            return obj["__class__"]
+        return obj.__class__.__name__
+
+    @staticmethod
+    def __attr_of(obj, attr):
+        """returns the attribute attr of obj, which may be a raw dictionary"""
+        if type(obj) is dict:
+            if attr in obj:
+                return obj[attr]
+            return getattr(classes[obj["__class__"]], attr, None)
+        return getattr(obj, attr, None)
+
+    @staticmethod
+    def __entry(obj):
+        """returns the (created_at, id) of obj, maybe a raw dictionary"""
+        if type(obj) is dict:
+            return (parse_time(obj["created_at"]), obj["id"])
+        return (obj.created_at, obj.id)
+
+    def __load(self, key):
+        """returns the object stored under key, instantiating it first if it
+        is still a raw dictionary"""
+        obj = self.__objects[key]
+        if type(obj) is dict:
+            buckets = self.__buckets()
+            obj = classes[obj["__class__"]](**obj)
+            self.__objects[key] = obj
+            buckets[obj.__class__.__name__][key] = obj
+        return obj
+
+    def __bucket(self, cls):
+        """returns the {<class name>.id: obj} bucket of the class cls"""
+        self.__map_in(self.__class_name(cls))
+        return self.__buckets().get(self.__class_name(cls), {})
+
+    def __unmapped(self, key):
+        """returns the dictionary of key in __snapshot if it was neither
+        loaded, replaced nor deleted yet, and marks it as resolved"""
+        if self.__snapshot is None:
+            return None
+        name, _, id = key.partition(".")
+        resolved = self.__resolved.setdefault(name, set())
+        if key in resolved:
+            return None
+        obj = self.__snapshot.get(name, id)
+        if obj is not None:
+            resolved.add(key)
+        return obj
+
+    def __unmapped_count(self, name):
+        """returns the number of objects of class name only in __snapshot"""
+        if self.__snapshot is None:
+            return 0
+        return self.__snapshot.count(name) - \
+            len(self.__resolved.get(name, ()))
+
+    def __map_in(self, name):
+        """loads into __objects the objects of class name that are still
+        only in __snapshot"""
+        if not self.__unmapped_count(name):
+            return
+        resolved = self.__resolved.setdefault(name, set())
+        for obj in self.__snapshot.records(name):
+            key = name + "." + obj["id"]
+            if key not in resolved:
+                resolved.add(key)
+                self.__put(key, classes[name](**obj))
+
+    def __buckets(self):
+        """returns the per-class buckets, rebuilding them and the reverse
+        indexes if __objects was replaced or modified behind our back"""
+        buckets = self.__by_class
+        if self.__indexed is not self.__objects or \
+                sum(map(len, buckets.values())) != len(self.__objects):
+            buckets = FileStorage.__by_class = {}
+            FileStorage.__order = {}
+            FileStorage.__refs = {}
+            FileStorage.__links = {}
+            FileStorage.__indexed = self.__objects
+            for key, obj in self.__objects.items():
+                buckets.setdefault(self.__name_of(obj), {})[key] = obj
+                self.__link(key, obj)
+        return buckets
+
+    def __put(self, key, obj):
+        """stores obj under key in __objects and in its class bucket"""
+        buckets = self.__buckets()
+        self.__unlink(key)
+        self.__unorder(self.__objects.get(key))
+        self.__objects[key] = obj
+        buckets.setdefault(self.__name_of(obj), {})[key] = obj
+        self.__link(key, obj)
+        order = self.__order.get(self.__name_of(obj))
+        if order is not None:
+            insort(order, self.__entry(obj))
+
+    def __pop(self, key):
+        """removes key from __objects and from its class bucket"""
+        buckets = self.__buckets()
+        obj = self.__objects.pop(key, None)
+        if obj is not None:
+            del buckets[self.__name_of(obj)][key]
+            self.__unlink(key)
+            self.__unorder(obj)
+
+    def __unorder(self, obj):
+        """removes obj from the sorted (created_at, id) list of its class"""
+        if obj is None or self.__name_of(obj) not in self.__order:
+            return
+        order = self.__order[self.__name_of(obj)]
+        entry = self.__entry(obj)
+        i = bisect_left(order, entry)
+        if i < len(order) and order[i] == entry:
+            del order[i]
+            return
+        # created_at was reassigned since obj was stored
+        for i, other in enumerate(order):
+            if other[1] == entry[1]:
+                del order[i]
+                return
+
+    def __link(self, key, obj):
+        """adds obj to the reverse indexes of its reference attributes"""
+        name = self.__name_of(obj)
+        if name not in references:
+            return
+        links = []
+        for attr in references[name]:
+            ids = self.__attr_of(obj, attr)
+            if isinstance(ids, list):
+                ids = tuple(ids)
+            index = self.__refs.setdefault((name, attr), {})
+            for id in ids if type(ids) is tuple else (ids,):
+                index.setdefault(id, {})[key] = None
+            links.append(ids)
+        self.__links[key] = tuple(links)
+
+    def __unlink(self, key):
+        """removes key from the reverse indexes it was added to"""
+        name = key.partition(".")[0]
+        for attr, ids in zip(references.get(name, ()),
+                             self.__links.pop(key, ())):
+            index = self.__refs[(name, attr)]
+            for id in ids if type(ids) is tuple else (ids,):
+                group = index.get(id)
+                if group is not None:
+                    group.pop(key, None)
+                    if not group:
+                        del index[id]
+
+    def __file_stamp(self):
+        """returns the (mtime, size, inode) of __file_path and the journal"""
+        stamp = []
+        for path in (self.__file_path, self.__journal.path):
+            try:
+                st = os.stat(path)
+            except OSError:
+                stamp.append(None)
+                continue
+            stamp.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        return tuple(stamp)
+
+    def __synced(self):
+        """records that __objects and __file_path hold the same content"""
+        FileStorage.__stamp = self.__file_stamp()
+        FileStorage.__generation += 1
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""
+Contains the Journal class
+"""
+
+import json
+import os
+
+
+class Journal:
+    """append-only log of the objects changed since the last snapshot"""
+
+    def __init__(self, path):
+        """Instantiate a Journal writing to path"""
+        self.path = path
+        self.records = None
+
+    def append(self, changes):
+        """appends one record per <class name>.id key of changes
+
+        changes maps each key to the object's dictionary, or to None when
+        the object was deleted
+        """
+        if not changes:
+            return
+        lines = [json.dumps({"key": key, "value": value}) + "\n"
+                 for key, value in changes.items()]
+        records = len(self)
+        with open(self.path, 'a+b') as f:
+            self.__repair(f)
+            f.write("".join(lines).encode())
+            f.flush()
+            os.fsync(f.fileno())
+        self.records = records + len(lines)
+
+    @staticmethod
+    def __repair(f):
+        """truncates f after its last complete line, dropping the record a
+        crash left half written, which would otherwise swallow the next"""
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        while end > 0:
+            start = max(0, end - 4096)
+            f.seek(start)
+            i = f.read(end - start).rfind(b"\n")
+            if i >= 0:
+                f.truncate(start + i + 1)
+                return
+            end = start
+        f.truncate(0)
+
+    def replay(self):
+        """yields the (key, value) records of the journal in order"""
+        self.records = 0
+        try:
+            f = open(self.path, 'r')
+        except OSError:
+            return
+        with f:
+            for line in f:
+                try:
+                    if not line.endswith("\n"):
+                        # torn write at the tail of the journal
+                        raise ValueError(line)
+                    record = json.loads(line)
+                except ValueError:
+                    # a record left unreadable by a crash, never
+                    # acknowledged
+                    continue
+                self.records += 1
+                yield record["key"], record["value"]
+
+    def clear(self):
+        """removes the journal once it has been folded into a snapshot"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.records = 0
+
+    def __len__(self):
+        """number of records currently in the journal"""
+        if self.records is None:
+            self.records = sum(1 for record in self.replay())
+        return self.records
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""
+Contains the search_places function FileStorage runs for POST
+/api/v1/places_search from its in-memory indexes, DBStorage compiling the
+same search to a single query
+"""
+
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+
+
+def search_places(storage, states=(), cities=(), amenities=()):
+    """returns the Place objects of the FileStorage storage matching the
+    ids of states, cities and amenities, in the same order as the original
+    places_search view
+
+    With neither states, cities nor amenities every place is returned.
+    Otherwise the places of the listed cities and of the cities of the
+    listed states are kept, or every place when there are none, and only
+    the places having all the listed amenities are returned.
+    """
+    if not (states or cities or amenities):
+        return list(storage.all(Place).values())
+
+    state_cities = {}
+    for state_id in states:
+        state = storage.get(State, state_id)
+        if state is not None:
+            for city in state.cities:
+                state_cities[city.id] = city
+    req_cities = {}
+    for city_id in cities:
+        city = storage.get(City, city_id)
+        if city is not None and city.id not in state_cities:
+            req_cities[city.id] = city
+    req_cities.update(state_cities)
+
+    places = [place for city in req_cities.values() for place in city.places]
+
+    groups = sorted(_amenities_places(storage, amenities), key=len)
+    allowed = None
+    for group in groups:
+        place_ids = {place.id for place in group}
+        allowed = place_ids if allowed is None else allowed & place_ids
+        if not allowed:
+            return []
+
+    if not places:
+        if not groups:
+            return list(storage.all(Place).values())
+        places = groups[0]
+    if allowed is None:
+        return places
+    return [place for place in places if place.id in allowed]
+
+
+def _amenities_places(storage, amenity_ids):
+    """returns, for each existing amenity of amenity_ids, the list of the
+    places having it"""
+    groups = []
+    for amenity_id in dict.fromkeys(amenity_ids):
+        if storage.get(Amenity, amenity_id) is not None:
+            groups.append(storage.related(Place, "amenity_ids", amenity_id))
+    return groups
@@ -0,0 +1,297 @@
+#!/usr/bin/python3
+"""
+Contains the snapshot serializers of FileStorage, selected by the
+HBNB_FILE_FORMAT environment variable, and a converter between them
+
+usage: python3 -m models.engine.serializers SOURCE DESTINATION
+converts SOURCE, in either format, to the other format in DESTINATION
+"""
+
+from array import array
+from contextlib import contextmanager
+import json
+import marshal
+import mmap
+import os
+import stat
+import struct
+import sys
+import tempfile
+import zlib
+
+
+@contextmanager
+def replacing(path, mode='w'):
+    """opens a temporary file next to path, which atomically replaces path
+    once it is written and flushed to disk, or is removed on error"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory,
+                               prefix=os.path.basename(path) + ".")
+    try:
+        try:
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        except OSError:
+            os.chmod(tmp, 0o644)
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    # makes the rename itself durable
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JSONSerializer:
+    """reads and writes snapshots as one JSON object keyed by
+    <class name>.id, the original file.json format"""
+
+    path = "file.json"
+
+    def dump(self, path, objects):
+        """writes the (key, obj) pairs of objects to path, obj being a model
+        instance or its dictionary"""
+        with replacing(path) as f:
+            f.write('{')
+            sep = ''
+            for key, obj in objects:
+                if type(obj) is dict:
+                    obj_json = json.dumps(obj)
+                else:
+                    obj_json = obj.to_json()
+                f.write(sep + json.dumps(key) + ': ' + obj_json)
+                sep = ', '
+            f.write('}')
+
+    def load(self, path, names=None):
+        """returns the {<class name>.id: dictionary} read from path, only
+        for the classes listed in names if given"""
+        with open(path, 'r') as f:
+            jo = json.load(f)
+        if names is None:
+            return jo
+        return {key: value for key, value in jo.items()
+                if key.partition(".")[0] in names}
+
+
+class BinarySerializer:
+    """reads and writes snapshots in a binary layout
+
+    The file starts with a magic number and an index of the classes it
+    holds, giving the offset, length, number of objects and block size of
+    the section of each class, so a class can be loaded without reading
+    the others. The objects of a section are encoded with marshal by
+    blocks of block_size dictionaries. The section starts with the hashes
+    of the ids of its objects, sorted, then the position of the object
+    having each hash, then the (offset, length) of each block: a single
+    object is found by decoding its block only. marshal may change between
+    Python versions: convert the snapshot to JSON before upgrading.
+    """
+
+    path = "file.bin"
+    magic = b"HBNB\x01"
+    # number of objects encoded together
+    block_size = 32
+    # number of sections
+    count = struct.Struct("<I")
+    # name length, then the name, then offset, length, number of objects
+    # and block size of the section
+    name = struct.Struct("<H")
+    entry = struct.Struct("<QQIH")
+    # crc32 of the id of an object, then its position in the section
+    record = struct.Struct("<I")
+    # offset and length of a block
+    block = struct.Struct("<QI")
+
+    def dump(self, path, objects):
+        """writes the (key, obj) pairs of objects to path, obj being a model
+        instance or its dictionary"""
+        sections = {}
+        for key, obj in objects:
+            if type(obj) is not dict:
+                obj = obj.to_dict()
+            sections.setdefault(key.partition(".")[0], []).append(obj)
+        names = {name: name.encode() for name in sections}
+        offset = len(self.magic) + self.count.size + sum(
+            self.name.size + len(name) + self.entry.size
+            for name in names.values())
+        header = [self.magic, self.count.pack(len(sections))]
+        body = []
+        size = self.block_size
+        for name, dicts in sections.items():
+            crcs = [zlib.crc32(obj["id"].encode()) for obj in dicts]
+            positions = array('I', sorted(range(len(dicts)),
+                                          key=crcs.__getitem__))
+            crcs = array('I', [crcs[i] for i in positions])
+            blocks = [marshal.dumps(dicts[i:i + size])
+                      for i in range(0, len(dicts), size)]
+            start = offset
+            offset += (2 * self.record.size * len(dicts) +
+                       self.block.size * len(blocks))
+            table = []
+            for block in blocks:
+                table.append(self.block.pack(offset, len(block)))
+                offset += len(block)
+            if sys.byteorder == "big":
+                crcs.byteswap()
+                positions.byteswap()
+            body.append(crcs.tobytes())
+            body.append(positions.tobytes())
+            body.extend(table)
+            body.extend(blocks)
+            header.append(self.name.pack(len(names[name])) + names[name])
+            header.append(self.entry.pack(start, offset - start,
+                                          len(dicts), size))
+        with replacing(path, 'wb') as f:
+            f.write(b"".join(header))
+            f.writelines(body)
+
+    def index(self, buf):
+        """returns the {<class name>: (offset, length, count, block size)}
+        index of the snapshot held by the buffer buf"""
+        if buf[:len(self.magic)] != self.magic:
+            raise ValueError("not a binary snapshot")
+        pos = len(self.magic) + self.count.size
+        sections = {}
+        for i in range(self.count.unpack_from(buf, len(self.magic))[0]):
+            size = self.name.unpack_from(buf, pos)[0]
+            pos += self.name.size
+            name = bytes(buf[pos:pos + size]).decode()
+            pos += size
+            sections[name] = self.entry.unpack_from(buf, pos)
+            pos += self.entry.size
+        return sections
+
+    def read_block(self, buf, section, i):
+        """returns the list of dictionaries of the i-th block of section"""
+        offset, length, count, size = section
+        pos = offset + 2 * count * self.record.size + i * self.block.size
+        start, length = self.block.unpack_from(buf, pos)
+        return marshal.loads(buf[start:start + length])
+
+    def records(self, buf, section):
+        """returns the list of the dictionaries of the objects of section,
+        given as its (offset, length, count, block size) index entry"""
+        offset, length, count, size = section
+        objects = []
+        for i in range((count + size - 1) // size):
+            objects.extend(self.read_block(buf, section, i))
+        return objects
+
+    def find(self, buf, section, id):
+        """returns the dictionary of the object id of section, given as its
+        (offset, length, count, block size) index entry, or None"""
+        offset, length, count, size = section
+        crc = zlib.crc32(id.encode())
+        low, high = 0, count
+        while low < high:
+            mid = (low + high) // 2
+            if self.record.unpack_from(
+                    buf, offset + mid * self.record.size)[0] < crc:
+                low = mid + 1
+            else:
+                high = mid
+        for i in range(low, count):
+            if self.record.unpack_from(
+                    buf, offset + i * self.record.size)[0] != crc:
+                break
+            pos = self.record.unpack_from(
+                buf, offset + (count + i) * self.record.size)[0]
+            obj = self.read_block(buf, section, pos // size)[pos % size]
+            if obj["id"] == id:
+                return obj
+        return None
+
+    def load(self, path, names=None):
+        """returns the {<class name>.id: dictionary} read from path, only
+        for the classes listed in names if given"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        objects = {}
+        for name, section in self.index(data).items():
+            if names is None or name in names:
+                for obj in self.records(data, section):
+                    objects[name + "." + obj["id"]] = obj
+        return objects
+
+    def open(self, path):
+        """returns a Snapshot mapping the file at path in memory"""
+        return Snapshot(self, path)
+
+
+class Snapshot:
+    """read-only view of a binary snapshot mapped in memory
+
+    Nothing is decoded until asked for, and processes mapping the same
+    file share its pages through the page cache.
+    """
+
+    def __init__(self, serializer, path):
+        """Instantiate a Snapshot mapping the file at path"""
+        self.serializer = serializer
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.sections = serializer.index(self.map)
+
+    def count(self, name):
+        """returns the number of objects of the class name"""
+        if name not in self.sections:
+            return 0
+        return self.sections[name][2]
+
+    def get(self, name, id):
+        """returns the dictionary of the object name.id, or None"""
+        if name not in self.sections:
+            return None
+        return self.serializer.find(self.map, self.sections[name], id)
+
+    def records(self, name):
+        """returns the list of the dictionaries of the objects of class
+        name"""
+        if name not in self.sections:
+            return []
+        return self.serializer.records(self.map, self.sections[name])
+
+    def close(self):
+        """unmaps the file"""
+        self.map.close()
+
+
+formats = {"json": JSONSerializer(), "binary": BinarySerializer()}
+
+
+def detect(path):
+    """returns the serializer able to read the snapshot at path"""
+    with open(path, 'rb') as f:
+        magic = f.read(len(BinarySerializer.magic))
+    if magic == BinarySerializer.magic:
+        return formats["binary"]
+    return formats["json"]
+
+
+def convert(source, destination):
+    """converts the snapshot at source to the other format in destination
+    and returns the serializer used to write it"""
+    reader = detect(source)
+    if reader is formats["json"]:
+        writer = formats["binary"]
+    else:
+        writer = formats["json"]
+    writer.dump(destination, reader.load(source).items())
+    return writer
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python3 -m models.engine.serializers SOURCE "
+                 "DESTINATION")
+    convert(sys.argv[1], sys.argv[2])
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatchDocs and TestBatch classes
+"""
+
+import inspect
+import models
+from api.v1.app import app
+from api.v1.views import batch
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+
+
+class TestBatchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the batch views"""
+    def test_pep8_conformance_batch(self):
+        """Test that api/v1/views/batch.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/batch.py',
+                                    'tests/test_api/test_v1/test_batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_batch_docstrings(self):
+        """Test for the module and function docstrings"""
+        self.assertTrue(len(batch.__doc__) >= 1)
+        for func in inspect.getmembers(batch, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+
+class TestBatch(unittest.TestCase):
+    """Test POST /api/v1/<collection>/batch"""
+    def setUp(self):
+        """Stores a state"""
+        self.client = app.test_client()
+        self.state = State(name="Batch")
+        models.storage.new(self.state)
+        models.storage.save()
+        self.objs = [self.state]
+
+    def tearDown(self):
+        """Removes the created objects"""
+        for obj in reversed(self.objs):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+
+    def post(self, collection, items):
+        """posts items to the batch endpoint of collection"""
+        return self.client.post('/api/v1/{}/batch'.format(collection),
+                                json=items)
+
+    def test_create(self):
+        """Test that every item is created in one request"""
+        count = models.storage.count(City)
+        items = [{"name": "City{}".format(i), "state_id": self.state.id}
+                 for i in range(3)]
+        response = self.post('cities', items)
+        self.assertEqual(response.status_code, 201)
+        cities = response.get_json()
+        self.objs.extend(City(id=city["id"]) for city in cities)
+        self.assertEqual([city["name"] for city in cities],
+                         ["City0", "City1", "City2"])
+        self.assertEqual(models.storage.count(City), count + 3)
+        models.storage.close()
+        for city in cities:
+            stored = models.storage.get(City, city["id"])
+            self.assertEqual(stored.state_id, self.state.id)
+
+    def test_invalid(self):
+        """Test that nothing is written when an item is invalid"""
+        count = models.storage.count(City)
+        response = self.post('cities', [{"name": "Ok",
+                                         "state_id": self.state.id},
+                                        {"state_id": self.state.id}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(b"Missing name", response.data)
+        response = self.post('cities', [{"name": "Lost",
+                                         "state_id": "unknown"}])
+        self.assertEqual(response.status_code, 404)
+        for state_id in (5, [self.state.id], None):
+            response = self.post('cities', [{"name": "c",
+                                             "state_id": state_id}])
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(b"Invalid state_id", response.data)
+        self.assertEqual(self.post('cities', {"name": "x"}).status_code, 400)
+        self.assertEqual(self.post('unknown', []).status_code, 404)
+        self.assertEqual(models.storage.count(City), count)
@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs, TestResponseCache and TestCachedViews classes
+"""
+
+import inspect
+import models
+from api.v1 import cache
+from api.v1.app import app
+from models.city import City
+from models.engine.backends import MemoryBackend
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of cache.py"""
+    def test_pep8_conformance_cache(self):
+        """Test that api/v1/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/cache.py',
+                                    'tests/test_api/test_v1/test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_docstrings(self):
+        """Test for the module, class and method docstrings"""
+        self.assertTrue(len(cache.__doc__) >= 1)
+        self.assertIsNot(cache.ResponseCache.__doc__, None)
+        for func in inspect.getmembers(cache.ResponseCache,
+                                       inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the ResponseCache class"""
+    def setUp(self):
+        """Builds a cache in a backend of its own"""
+        self.backend = MemoryBackend()
+        self.responses = cache.ResponseCache(self.backend, 60, 100)
+
+    def test_lookup(self):
+        """Test that entries are found with the generations of classes"""
+        responses = self.responses
+        self.assertEqual(responses.lookup("a", ["State"]), (None, (0,)))
+        responses.put("a", (0,), 200, [("ETag", "x")], b"a")
+        self.assertEqual(responses.lookup("a", ["State"]),
+                         ((200, [("ETag", "x")], b"a"), (0,)))
+        responses.put("b", (0,), 200, [], b"b" * 101)
+        self.assertEqual(responses.lookup("b", ["State"]), (None, (0,)))
+        stats = responses.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertAlmostEqual(stats["hit_ratio"], 1 / 3)
+
+    def test_invalidation(self):
+        """Test that entries go stale with the generations"""
+        responses = self.responses
+        responses.put("a", (0, 0), 200, [], b"a")
+        self.backend.bump(["City"])
+        self.assertEqual(responses.lookup("a", ["State", "City"]),
+                         (None, (0, 1)))
+        self.assertEqual(responses.stats()["invalidations"], 1)
+
+    def test_disabled(self):
+        """Test that a cache with a ttl of 0 keeps nothing"""
+        responses = cache.ResponseCache(self.backend, 0, 100)
+        responses.put("a", (0,), 200, [], b"a")
+        self.assertEqual(responses.lookup("a", ["State"]), (None, (0,)))
+        self.assertEqual(self.backend.stats()["entries"], 0)
+
+
+class TestCachedViews(unittest.TestCase):
+    """Test the GET endpoints with the response cache enabled"""
+    def setUp(self):
+        """Stores a place and enables the cache"""
+        self.client = app.test_client()
+        self.user = User(email="cache@hbnb.io", password="pwd")
+        self.state = State(name="Cache")
+        self.city = City(name="Cache", state_id=self.state.id)
+        self.place = Place(name="Cache", city_id=self.city.id,
+                           user_id=self.user.id)
+        self.objs = [self.user, self.state, self.city, self.place]
+        for obj in self.objs:
+            models.storage.new(obj)
+        models.storage.save()
+        models.cache.clear()
+        responses = cache.ResponseCache(models.cache, 60, 1 << 20)
+        for patcher in (mock.patch.object(cache, "responses", responses),
+                        mock.patch.object(models.cache, "shared", True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Removes the stored objects"""
+        for obj in reversed(self.objs):
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def add_review(self, text):
+        """stores a review of the place"""
+        review = Review(text=text, place_id=self.place.id,
+                        user_id=self.user.id)
+        models.storage.new(review)
+        models.storage.save()
+        self.objs.append(review)
+
+    def test_reviews(self):
+        """Test that a new review evicts the reviews of the place"""
+        url = '/api/v1/places/{}/reviews'.format(self.place.id)
+        self.add_review("first")
+        first = self.client.get(url)
+        self.assertEqual(first.get_json()[0]["text"], "first")
+        again = self.client.get(url)
+        self.assertEqual(again.data, first.data)
+        self.assertEqual(again.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(cache.responses.stats()["hits"], 1)
+        self.client.get(url + '?limit=1').get_data()
+        self.assertEqual(cache.responses.stats()["hits"], 1)
+        self.add_review("second")
+        texts = [r["text"] for r in self.client.get(url).get_json()]
+        self.assertEqual(sorted(texts), ["first", "second"])
+        self.assertEqual(cache.responses.stats()["invalidations"], 1)
+        self.client.get('/api/v1/places/' + self.place.id).get_data()
+        self.assertEqual(cache.responses.stats()["hits"], 1)
+
+    def test_entity(self):
+        """Test that a cached object still answers If-None-Match"""
+        url = '/api/v1/cities/' + self.city.id
+        etag = self.client.get(url).headers["ETag"]
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(cache.responses.stats()["hits"], 1)
+        self.client.put(url, json={"name": "Changed"})
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.get_json()["name"], "Changed")
+
+    def test_metrics(self):
+        """Test that the metrics of the cache are exposed"""
+        for i in range(2):
+            # streamed bodies are stored once they were read
+            self.client.get('/api/v1/states').get_data()
+        metrics = self.client.get('/api/v1/metrics').get_json()
+        self.assertEqual(metrics["response_cache"]["hits"], 1)
+        self.assertEqual(metrics["response_cache"]["hit_ratio"], 0.5)
+        self.assertGreaterEqual(metrics["cache"]["entries"], 1)
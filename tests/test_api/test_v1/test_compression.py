@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Contains the TestCompressionDocs and TestCompression classes
+"""
+
+import gzip
+import inspect
+import json
+import models
+from api.v1 import compression
+from api.v1.app import app
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+import zlib
+
+
+class TestCompressionDocs(unittest.TestCase):
+    """Tests to check the documentation and style of compression.py"""
+    def test_pep8_conformance_compression(self):
+        """Test that api/v1/compression.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/compression.py',
+                                    'tests/test_api/test_v1/'
+                                    'test_compression.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_compression_docstrings(self):
+        """Test for the module and function docstrings"""
+        self.assertTrue(len(compression.__doc__) >= 1)
+        for func in inspect.getmembers(compression, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+
+class TestCompression(unittest.TestCase):
+    """Test the negotiation and compression of the responses"""
+    def setUp(self):
+        """Stores a state"""
+        self.client = app.test_client()
+        self.state = State(name="Compression")
+        models.storage.new(self.state)
+        models.storage.save()
+
+    def tearDown(self):
+        """Removes the state"""
+        models.storage.delete(self.state)
+        models.storage.save()
+
+    def get(self, url, encoding):
+        """returns the response to GET url accepting encoding"""
+        return self.client.get(url, headers={"Accept-Encoding": encoding})
+
+    def test_streams(self):
+        """Test that streamed bodies decompress to the whole body"""
+        chunks = ["[", b'{"a": 1}', "]"]
+        body = b"".join(compression.compress_stream("gzip", chunks))
+        self.assertEqual(gzip.decompress(body), b'[{"a": 1}]')
+        body = b"".join(compression.compress_stream("deflate", chunks))
+        self.assertEqual(zlib.decompress(body), b'[{"a": 1}]')
+
+    def test_streamed(self):
+        """Test that a streamed list is compressed whatever its size"""
+        plain = self.client.get('/api/v1/states').get_data()
+        response = self.get('/api/v1/states', "gzip, deflate")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(gzip.decompress(response.get_data()), plain)
+
+    def test_min_size(self):
+        """Test that bodies below the minimum size are sent as they are"""
+        response = self.get('/api/v1/states/' + self.state.id, "gzip")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        with mock.patch.object(compression, "min_size", 0):
+            response = self.get('/api/v1/states/' + self.state.id,
+                                "gzip;q=0.5, deflate")
+        self.assertEqual(response.headers["Content-Encoding"], "deflate")
+        body = json.loads(zlib.decompress(response.get_data()))
+        self.assertEqual(body["name"], "Compression")
+        self.assertEqual(int(response.headers["Content-Length"]),
+                         len(response.get_data()))
+
+    def test_not_compressed(self):
+        """Test the responses left alone"""
+        response = self.get('/api/v1/states', "identity")
+        self.assertNotIn("Content-Encoding", response.headers)
+        url = '/api/v1/states/' + self.state.id
+        etag = self.client.get(url).headers["ETag"]
+        with mock.patch.object(compression, "min_size", 0):
+            response = self.client.get(url, headers={
+                "Accept-Encoding": "gzip", "If-None-Match": etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertNotIn("Content-Encoding", response.headers)
+            with mock.patch.object(compression, "encodings", ()):
+                response = self.get(url, "gzip")
+            self.assertNotIn("Content-Encoding", response.headers)
+
+    @unittest.skipIf(compression.brotli is None, "brotli not installed")
+    def test_brotli(self):
+        """Test that brotli is preferred when it is available"""
+        response = self.get('/api/v1/states', "gzip, deflate, br")
+        self.assertEqual(response.headers["Content-Encoding"], "br")
+        body = compression.brotli.decompress(response.get_data())
+        self.assertEqual(body, self.client.get('/api/v1/states').get_data())
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+Contains the TestConditionalDocs and TestConditional classes
+"""
+
+import inspect
+import models
+from api.v1 import conditional
+from api.v1.app import app
+from models.city import City
+from models.engine.backends import SocketBackend
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestConditionalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of conditional.py"""
+    def test_pep8_conformance_conditional(self):
+        """Test that api/v1/conditional.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/conditional.py',
+                                    'tests/test_api/test_v1/'
+                                    'test_conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_conditional_docstrings(self):
+        """Test for the module and function docstrings"""
+        self.assertTrue(len(conditional.__doc__) >= 1)
+        for func in inspect.getmembers(conditional, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+
+class TestConditional(unittest.TestCase):
+    """Test the ETags and If-None-Match on the v1 API"""
+    def setUp(self):
+        """Stores a state, with the generations of every process"""
+        patcher = mock.patch.object(models.cache, "shared", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = app.test_client()
+        self.state = State(name="Conditional")
+        models.storage.new(self.state)
+        models.storage.save()
+        self.objs = [self.state]
+
+    def tearDown(self):
+        """Removes the stored objects"""
+        for obj in reversed(self.objs):
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def get(self, url, etag=None):
+        """gets url, conditionally on etag if given"""
+        headers = {} if etag is None else {"If-None-Match": etag}
+        return self.client.get(url, headers=headers)
+
+    def test_entity(self):
+        """Test that an object answers 304 until it is updated"""
+        url = '/api/v1/states/' + self.state.id
+        response = self.get(url)
+        etag = response.headers["ETag"]
+        self.assertEqual(response.status_code, 200)
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+        self.client.put(url, json={"name": "Changed"})
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Changed")
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_collection(self):
+        """Test that a collection answers 304 until an object of its
+        classes changes"""
+        url = '/api/v1/states/{}/cities'.format(self.state.id)
+        etag = self.get(url).headers["ETag"]
+        self.assertEqual(self.get(url, etag).status_code, 304)
+        self.assertEqual(self.get(url + '?limit=1', etag).status_code, 200)
+        self.assertEqual(self.get('/api/v1/states', etag).status_code, 200)
+        city = City(name="Conditional", state_id=self.state.id)
+        models.storage.new(city)
+        models.storage.save()
+        self.objs.append(city)
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 1)
+        etag = response.headers["ETag"]
+        self.assertEqual(self.get(url, etag).status_code, 304)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_unshared(self):
+        """Test that DBStorage lists get no ETag without the cache server,
+        which alone sees the writes of every process"""
+        with mock.patch.object(models.cache, "shared", False):
+            response = self.get('/api/v1/states')
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("ETag", response.headers)
+            url = '/api/v1/states/' + self.state.id
+            self.assertIn("ETag", self.get(url).headers)
+
+    def test_cache_unreachable(self):
+        """Test that lists are served without an ETag while the cache
+        server is unreachable"""
+        backend = SocketBackend("/nonexistent/cache.sock")
+        with mock.patch.object(models, "cache", backend), \
+                self.assertLogs("models.engine.backends", "WARNING"):
+            response = self.get('/api/v1/states')
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("ETag", response.headers)
+            self.assertIn(self.state.id, response.get_data(as_text=True))
+
+    def test_stats(self):
+        """Test that the stats change with the counts"""
+        etag = self.get('/api/v1/stats').headers["ETag"]
+        self.assertEqual(self.get('/api/v1/stats', etag).status_code, 304)
+        state = State(name="Stats")
+        models.storage.new(state)
+        models.storage.save()
+        self.objs.append(state)
+        self.assertEqual(self.get('/api/v1/stats', etag).status_code, 200)
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Contains the TestIndexDocs and TestStats classes
+"""
+
+import inspect
+import models
+from api.v1.app import app
+from api.v1.views import index
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the index views"""
+    def test_pep8_conformance_index(self):
+        """Test that api/v1/views/index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/index.py',
+                                    'tests/test_api/test_v1/test_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_index_docstrings(self):
+        """Test for the module and function docstrings"""
+        self.assertTrue(len(index.__doc__) >= 1)
+        for func in inspect.getmembers(index, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+
+class TestStats(unittest.TestCase):
+    """Test GET /api/v1/stats"""
+    def setUp(self):
+        """Empties the stats cache"""
+        self.client = app.test_client()
+        self.states = []
+        index.stats_cache.clear()
+
+    def tearDown(self):
+        """Removes the states"""
+        for state in self.states:
+            models.storage.delete(state)
+        models.storage.save()
+        index.stats_cache.clear()
+
+    def add_state(self):
+        """stores a new state"""
+        self.states.append(State(name="Stats"))
+        models.storage.new(self.states[-1])
+        models.storage.save()
+
+    def test_stats(self):
+        """Test that the stats match the counts of each class"""
+        self.add_state()
+        stats = self.client.get('/api/v1/stats').get_json()
+        self.assertEqual(set(stats), {"amenities", "cities", "places",
+                                      "reviews", "states", "users"})
+        self.assertEqual(stats["states"], models.storage.count(State))
+        approximate = self.client.get('/api/v1/stats?approximate=1')
+        self.assertEqual(approximate.status_code, 200)
+
+    def test_stats_ttl(self):
+        """Test that the stats are reused for HBNB_API_STATS_TTL seconds"""
+        states = self.client.get('/api/v1/stats').get_json()["states"]
+        self.add_state()
+        stats = self.client.get('/api/v1/stats').get_json()
+        self.assertEqual(stats["states"], states + 1)
+        with mock.patch.object(index, "stats_ttl", 60):
+            self.client.get('/api/v1/stats')
+            self.add_state()
+            stats = self.client.get('/api/v1/stats').get_json()
+        self.assertEqual(stats["states"], states + 1)
+        index.stats_cache.clear()
+        stats = self.client.get('/api/v1/stats').get_json()
+        self.assertEqual(stats["states"], states + 2)
+
+    def test_stats_detailed(self):
+        """Test that ?detailed=1 adds the places of each state and city"""
+        self.add_state()
+        user = User(email="stats@hbnb.io", password="pwd")
+        city = City(name="Stats", state_id=self.states[-1].id)
+        places = [Place(name="Stats", city_id=city.id, user_id=user.id)
+                  for i in range(2)]
+        for obj in [user, city] + places:
+            models.storage.new(obj)
+        models.storage.save()
+        self.states[:0] = places + [city, user]
+        stats = self.client.get('/api/v1/stats?detailed=1').get_json()
+        self.assertEqual(stats["places_by_city"][city.id], 2)
+        self.assertEqual(stats["places_by_state"][self.states[-1].id], 2)
+        self.assertEqual(sum(stats["places_by_city"].values()),
+                         stats["places"])
+        self.assertNotIn("places_by_city",
+                         self.client.get('/api/v1/stats').get_json())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Contains the TestJSONProviderDocs and TestJSONProvider classes
+"""
+
+from datetime import datetime
+import inspect
+import json
+from api.v1 import json_provider
+from api.v1.app import app
+import pep8
+import unittest
+from unittest import mock
+JSONProvider = json_provider.JSONProvider
+
+
+class TestJSONProviderDocs(unittest.TestCase):
+    """Tests to check the documentation and style of json_provider.py"""
+    def test_pep8_conformance_json_provider(self):
+        """Test that api/v1/json_provider.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/json_provider.py',
+                                    'tests/test_api/test_v1/'
+                                    'test_json_provider.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_json_provider_docstrings(self):
+        """Test for the module, class and method docstrings"""
+        self.assertTrue(len(json_provider.__doc__) >= 1)
+        self.assertIsNot(JSONProvider.__doc__, None)
+        for func in inspect.getmembers(JSONProvider, inspect.isfunction):
+            if func[0] not in vars(JSONProvider):
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestJSONProvider(unittest.TestCase):
+    """Test that both encoders write the same JSON"""
+    def setUp(self):
+        """Builds a document with a datetime"""
+        self.obj = {"b": [1, 2.5, None, "é"], "a": True,
+                    "created_at": datetime(2017, 3, 25, 2, 17, 6)}
+        self.expected = {"a": True, "b": [1, 2.5, None, "é"],
+                         "created_at": "2017-03-25T02:17:06.000000"}
+
+    def check(self, provider):
+        """checks that provider encodes and decodes self.obj"""
+        encoded = provider.dumps(self.obj)
+        self.assertEqual(json.loads(encoded), self.expected)
+        self.assertLess(encoded.index('"a"'), encoded.index('"b"'))
+        self.assertEqual(provider.loads(encoded), self.expected)
+        self.assertEqual(provider.loads(provider.dumps({"n": 2 ** 70})),
+                         {"n": 2 ** 70})
+        with app.app_context():
+            response = provider.response(self.obj)
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(json.loads(response.get_data()), self.expected)
+
+    @unittest.skipIf(json_provider.orjson is None, "orjson not installed")
+    def test_fast(self):
+        """Test the encoding with orjson"""
+        with mock.patch.object(JSONProvider, "fast", json_provider.orjson):
+            self.check(JSONProvider(app))
+
+    def test_json(self):
+        """Test the encoding with the json module"""
+        with mock.patch.object(JSONProvider, "fast", None):
+            self.check(JSONProvider(app))
+
+    def test_app(self):
+        """Test that the API encodes with the provider"""
+        self.assertIsInstance(app.json, JSONProvider)
+        response = app.test_client().get('/api/v1/status')
+        self.assertEqual(response.get_json(), {"status": "OK"})
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaginationDocs and TestPagination classes
+"""
+
+import inspect
+import models
+from api.v1 import pagination
+from api.v1.app import app
+from models.state import State
+import pep8
+import unittest
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pagination.py"""
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/pagination.py',
+                                    'tests/test_api/test_v1/'
+                                    'test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_docstrings(self):
+        """Test for the module and function docstrings"""
+        self.assertTrue(len(pagination.__doc__) >= 1)
+        for func in inspect.getmembers(pagination, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+
+class TestPagination(unittest.TestCase):
+    """Test limit, cursor and fields on GET /api/v1/states"""
+    @classmethod
+    def setUpClass(cls):
+        """Stores five states"""
+        cls.client = app.test_client()
+        cls.states = [State(name="State{}".format(i)) for i in range(5)]
+        for state in cls.states:
+            models.storage.new(state)
+        models.storage.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Removes the states"""
+        for state in cls.states:
+            models.storage.delete(state)
+        models.storage.save()
+
+    def names(self, response):
+        """returns the names of the test states in a response"""
+        return [s.get('name') for s in response.get_json()
+                if s.get('name', '').startswith('State')]
+
+    def test_pages(self):
+        """Test that following the Link headers walks every state once"""
+        names = []
+        url = '/api/v1/states?limit=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.get_json()), 2)
+            names.extend(self.names(response))
+            link = response.headers.get('Link')
+            url = link[1:link.index('>')] if link else None
+        self.assertEqual(names, [s.name for s in self.states])
+
+    def test_fields(self):
+        """Test that fields projects each object"""
+        response = self.client.get('/api/v1/states?fields=id,name')
+        for state in response.get_json():
+            self.assertEqual(sorted(state), ['id', 'name'])
+
+    def test_invalid(self):
+        """Test that bad limits and cursors are rejected"""
+        self.assertEqual(self.client.get('/api/v1/states?limit=0')
+                         .status_code, 400)
+        # a digit int() does not parse
+        self.assertEqual(self.client.get('/api/v1/states?limit=%C2%B2')
+                         .status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/states?cursor=%%%')
+                         .status_code, 400)
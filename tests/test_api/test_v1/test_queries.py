@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Contains the TestQueries class
+"""
+
+from api.v1.app import app
+import importlib
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import unittest
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestQueries(unittest.TestCase):
+    """Test that the number of queries of an endpoint does not grow with
+    the number of rows it returns"""
+    @classmethod
+    def setUpClass(cls):
+        """Stores a state with a city and a place"""
+        from sqlalchemy import event
+        cls.event = event
+        cls.client = app.test_client()
+        cls.objs = []
+        cls.user = User(email="queries@hbnb.io", password="pwd")
+        cls.wifi = Amenity(name="Wifi")
+        cls.state = State(name="Queries")
+        cls.store(cls.user, cls.wifi, cls.state)
+        cls.grow()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Removes the stored objects"""
+        for obj in reversed(cls.objs):
+            models.storage.delete(obj)
+        models.storage.save()
+
+    @classmethod
+    def store(cls, *objs):
+        """saves objs, to be removed by tearDownClass, and starts a new
+        session so that requests do not find them already loaded"""
+        for obj in objs:
+            models.storage.new(obj)
+            cls.objs.append(obj)
+        models.storage.save()
+        models.storage.close()
+
+    @classmethod
+    def grow(cls):
+        """adds a city with two places having the amenity to the state"""
+        city = City(name="City", state_id=cls.state.id)
+        places = [Place(name="Place", city_id=city.id, user_id=cls.user.id)
+                  for i in range(2)]
+        for place in places:
+            place.amenities.append(cls.wifi)
+        cls.store(city, *places)
+
+    def queries(self, request):
+        """returns the number of queries request() runs"""
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            """records statement"""
+            statements.append(statement)
+
+        self.event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = request()
+            # streamed bodies run their queries as they are read
+            response.get_data()
+            self.assertEqual(response.status_code, 200)
+        finally:
+            self.event.remove(engine, "before_cursor_execute", count)
+        return len(statements)
+
+    def assertBounded(self, request):
+        """checks that request() runs as many queries with more rows"""
+        before = self.queries(request)
+        self.grow()
+        self.grow()
+        self.assertEqual(self.queries(request), before)
+
+    def test_places_search(self):
+        """Test POST /api/v1/places_search by state and amenity"""
+        body = {"states": [self.state.id], "amenities": [self.wifi.id]}
+
+        def request():
+            """searches the places of the state having the amenity"""
+            return self.client.post('/api/v1/places_search', json=body)
+        self.assertEqual(self.queries(request), 1)
+        self.assertBounded(request)
+
+    def test_cities_by_states(self):
+        """Test the cities_by_states page"""
+        module = importlib.import_module("web_flask.8-cities_by_states")
+        client = module.app.test_client()
+        self.assertBounded(lambda: client.get('/cities_by_states'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Contains the TestStreamingDocs and TestStreaming classes
+"""
+
+import inspect
+import json
+import models
+from api.v1 import streaming
+from api.v1.app import app
+from models.amenity import Amenity
+import pep8
+import unittest
+
+
+class TestStreamingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of streaming.py"""
+    def test_pep8_conformance_streaming(self):
+        """Test that api/v1/streaming.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/streaming.py',
+                                    'tests/test_api/test_v1/'
+                                    'test_streaming.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_streaming_docstrings(self):
+        """Test for the module and function docstrings"""
+        self.assertTrue(len(streaming.__doc__) >= 1)
+        for func in inspect.getmembers(streaming, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+
+class TestStreaming(unittest.TestCase):
+    """Test the streamed GET /api/v1/amenities listing"""
+    @classmethod
+    def setUpClass(cls):
+        """Stores more amenities than fit in one chunk"""
+        cls.client = app.test_client()
+        cls.amenities = [Amenity(name="Amenity{}".format(i))
+                         for i in range(streaming.chunk_size + 5)]
+        for amenity in cls.amenities:
+            models.storage.new(amenity)
+        models.storage.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Removes the amenities"""
+        for amenity in cls.amenities:
+            models.storage.delete(amenity)
+        models.storage.save()
+
+    def test_json_array(self):
+        """Test that the streamed body is a valid JSON array"""
+        response = self.client.get('/api/v1/amenities')
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, 'application/json')
+        ids = {amenity['id'] for amenity in json.loads(response.data)}
+        self.assertTrue({a.id for a in self.amenities} <= ids)
+
+    def test_ndjson(self):
+        """Test that NDJSON is sent when the client accepts it"""
+        response = self.client.get('/api/v1/amenities',
+                                   headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = response.get_data(as_text=True).splitlines()
+        ids = {json.loads(line)['id'] for line in lines}
+        self.assertTrue({a.id for a in self.amenities} <= ids)
+
+    def test_empty(self):
+        """Test that an empty listing is an empty JSON array"""
+        with app.test_request_context('/'):
+            self.assertEqual(streaming.stream_json(iter(())).get_data(),
+                             b'[]\n')
@@ -158,3 +158,36 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_to_dict_cache(self):
+        """Test that to_dict is cached until an attribute changes"""
+        inst = BaseModel()
+        d = inst.to_dict()
+        d["name"] = "changed by caller"
+        self.assertNotIn("name", inst.to_dict())
+        self.assertEqual(inst.to_json(), inst.to_json())
+        inst.name = "Holberton"
+        self.assertEqual(inst.to_dict()["name"], "Holberton")
+        self.assertIn('"name": "Holberton"', inst.to_json())
+        self.assertNotIn("_cache", inst.__dict__)
+        inst.tags = []
+        inst.to_dict()
+        inst.tags.append("wifi")
+        with mock.patch('models.storage'):
+            inst.save()
+        self.assertEqual(inst.to_dict()["tags"], ["wifi"])
+
+    def test_time_codec(self):
+        """Test that parse_time and format_time match strptime/strftime"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        for value in (datetime(2017, 9, 28, 21, 3, 54, 52298),
+                      datetime(2017, 9, 28, 21, 3, 54)):
+            with self.subTest(value=value):
+                string = models.base_model.format_time(value)
+                self.assertEqual(string, value.strftime(t_format))
+                self.assertEqual(models.base_model.parse_time(string), value)
+        with self.assertRaises(ValueError):
+            models.base_model.parse_time("2017-09-28")
+        with self.assertRaises(ValueError):
+            models.base_model.parse_time("2017-13-28T21:03:54.052298")
@@ -0,0 +1,220 @@
+#!/usr/bin/python3
+"""
+Contains the TestBackendsDocs, TestMemoryBackend and TestCacheServer
+classes
+"""
+
+import inspect
+import models
+from models.engine import backends
+from models.state import State
+import os
+import pep8
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+MemoryBackend = backends.MemoryBackend
+
+
+class TestBackendsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the backends module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.classes = [backends.MemoryBackend, backends.CacheHandler,
+                       backends.CacheServer, backends.SocketBackend]
+
+    def test_pep8_conformance_backends(self):
+        """Test that models/engine/backends.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/backends.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_backends.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_backends_module_docstring(self):
+        """Test for the backends.py module docstring"""
+        self.assertIsNot(backends.__doc__, None,
+                         "backends.py needs a docstring")
+        self.assertTrue(len(backends.__doc__) >= 1,
+                        "backends.py needs a docstring")
+
+    def test_backends_func_docstrings(self):
+        """Test for the presence of docstrings in the backends classes"""
+        for cls in self.classes:
+            self.assertIsNot(cls.__doc__, None)
+            for func in inspect.getmembers(cls, inspect.isfunction):
+                if func[0] not in vars(cls):
+                    continue
+                self.assertIsNot(func[1].__doc__, None,
+                                 "{:s} method needs a docstring".format(
+                                     func[0]))
+
+
+class TestMemoryBackend(unittest.TestCase):
+    """Test the MemoryBackend class"""
+    def test_lru(self):
+        """Test that the least recently used values are evicted first"""
+        backend = MemoryBackend(2, 100)
+        backend.store("a", b"a", 60)
+        backend.store("b", b"b", 60)
+        self.assertEqual(backend.lookup(["a"]), ([b"a"], []))
+        backend.store("c", b"c", 60)
+        self.assertEqual(backend.lookup(["b", "c"]), ([None, b"c"], []))
+        backend.store("d", b"d" * 100, 60)
+        self.assertEqual(list(backend.values), ["d"])
+        backend.store("e", b"e" * 101, 60)
+        self.assertNotIn("e", backend.values)
+        stats = backend.stats()
+        self.assertEqual(stats["evictions"], 3)
+        self.assertEqual(stats["bytes"], 100)
+
+    def test_ttl(self):
+        """Test that values expire"""
+        backend = MemoryBackend()
+        backend.store("a", b"a", 0)
+        self.assertEqual(backend.lookup(["a"]), ([None], []))
+        self.assertEqual(backend.stats()["expirations"], 1)
+        self.assertEqual(backend.stats()["entries"], 0)
+
+    def test_counters(self):
+        """Test that counters are bumped and survive clear()"""
+        backend = MemoryBackend()
+        backend.bump(["State", "City", "State"])
+        backend.store("a", b"a", 60)
+        backend.delete(["a"])
+        self.assertEqual(backend.lookup(["a"], ["State", "City", "User"]),
+                         ([None], [2, 1, 0]))
+        backend.store("a", b"a", 60)
+        backend.clear()
+        self.assertEqual(backend.lookup(["a"], ["State"]), ([None], [2]))
+
+
+class TestCacheServer(unittest.TestCase):
+    """Test the SocketBackends of two workers sharing a CacheServer"""
+    def setUp(self):
+        """Starts a CacheServer on a temporary socket"""
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, "cache.sock")
+        self.server = backends.CacheServer(self.path, MemoryBackend())
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+
+        def stop():
+            """stops the server and removes its socket"""
+            self.server.shutdown()
+            self.server.server_close()
+            thread.join()
+            os.rmdir(directory)
+        self.addCleanup(stop)
+
+    def test_shared(self):
+        """Test that values and counters are shared by the clients"""
+        first = backends.configured("unix:" + self.path)
+        second = backends.SocketBackend(self.path)
+        self.assertEqual(oct(os.stat(self.path).st_mode & 0o777), "0o600")
+        first.store("a", b"a", 60)
+        first.bump(["State"])
+        self.assertEqual(second.lookup(["a", "b"], ["State"]),
+                         ([b"a", None], [1]))
+        self.assertEqual(first.token, second.token)
+        second.delete(["a"])
+        self.assertEqual(first.lookup(["a"]), ([None], []))
+        self.assertEqual(first.stats()["entries"], 0)
+        with self.assertRaises(RuntimeError):
+            # counters must be hashable
+            first.lookup([], [["State"]])
+
+    def test_lost_bumps(self):
+        """Test that the bumps made while the server was unreachable are
+        made once it is back"""
+        first = backends.SocketBackend(self.path)
+        second = backends.SocketBackend(self.path)
+        first.retry_after = 0
+        first.bump(["State"])
+        second.store("response:/states", b"old", 60)
+        with mock.patch.object(first, "path", self.path + ".missing"), \
+                self.assertLogs("models.engine.backends", "WARNING"):
+            first.local.pid = None
+            first.bump(["State"])
+        self.assertEqual(first.lost, {"State"})
+        self.assertEqual(second.lookup([], ["State"]), ([], [1]))
+        self.assertEqual(first.lookup([], ["City"]), ([], [0]))
+        self.assertEqual(first.lost, set())
+        self.assertEqual(second.lookup([], ["State"]), ([], [2]))
+
+    def test_configured(self):
+        """Test that HBNB_CACHE selects the backend"""
+        self.assertIsInstance(backends.configured("memory"), MemoryBackend)
+        with self.assertRaises(ValueError):
+            backends.configured("redis://localhost")
+
+
+class TestUnreachable(unittest.TestCase):
+    """Test that the storage keeps working while the cache server is
+    unreachable"""
+    def setUp(self):
+        """Points models.cache to a socket nobody listens on"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        self.path = os.path.join(directory, "missing.sock")
+        self.backend = backends.SocketBackend(self.path)
+
+    def test_fail_soft(self):
+        """Test that the calls miss or do nothing"""
+        backend = self.backend
+        with self.assertLogs("models.engine.backends", "WARNING") as logs:
+            self.assertEqual(backend.lookup(["a"], ["State"]),
+                             ([None], [None]))
+            backend.store("a", b"a", 60)
+            backend.bump(["State"])
+            backend.delete(["a"])
+            backend.clear()
+            self.assertIsNone(backend.token)
+            self.assertEqual(backend.stats(), {"available": False})
+        self.assertTrue(backend.down)
+        # logged once per outage
+        self.assertEqual(len(logs.output), 1)
+
+    def test_timeout(self):
+        """Test that a server which does not answer is given up on, then
+        skipped for a while"""
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(os.remove, self.path)
+        self.addCleanup(server.close)
+        server.bind(self.path)
+        server.listen()
+        self.backend.timeout = 0.05
+        with self.assertLogs("models.engine.backends", "WARNING"):
+            start = time.monotonic()
+            self.assertEqual(self.backend.lookup([], ["State"]),
+                             ([], [None]))
+            self.assertLess(time.monotonic() - start, 1)
+        self.assertTrue(self.backend.down)
+        self.backend.bump(["State"])
+        self.assertEqual(self.backend.lost, {"State"})
+
+    def test_storage(self):
+        """Test that the storage writes and reads without the server"""
+        with mock.patch.object(models, "cache", self.backend):
+            state = State(name="Unreachable")
+            models.storage.new(state)
+            models.storage.save()
+            self.assertIsNone(models.storage.class_generation(State))
+            self.assertEqual(models.storage.get(State, state.id).name,
+                             "Unreachable")
+            models.storage.delete(state)
+            models.storage.save()
+
+    def test_import(self):
+        """Test that models can be imported"""
+        env = dict(os.environ, HBNB_CACHE="unix:" + self.path)
+        result = subprocess.run([sys.executable, "-c", "import models"],
+                                env=env, stderr=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0, result.stderr)
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""
+Contains the TestColumnarDocs and TestTable classes
+"""
+
+from datetime import datetime
+import inspect
+import models
+from models.engine import columnar
+from models.place import Place
+from models.user import User
+import pep8
+import unittest
+Table = columnar.Table
+
+
+class TestColumnarDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the columnar module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.classes = [columnar.Table, columnar.Column, columnar.Row]
+
+    def test_pep8_conformance_columnar(self):
+        """Test that models/engine/columnar.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/columnar.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_columnar.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_columnar_module_docstring(self):
+        """Test for the columnar.py module docstring"""
+        self.assertIsNot(columnar.__doc__, None,
+                         "columnar.py needs a docstring")
+        self.assertTrue(len(columnar.__doc__) >= 1,
+                        "columnar.py needs a docstring")
+
+    def test_columnar_func_docstrings(self):
+        """Test for the presence of docstrings in the columnar classes"""
+        for cls in self.classes:
+            self.assertIsNot(cls.__doc__, None)
+            for func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertIsNot(func[1].__doc__, None,
+                                 "{:s} method needs a docstring".format(
+                                     func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestTable(unittest.TestCase):
+    """Test the Table class and its rows"""
+    def setUp(self):
+        """Builds a table from a Place dictionary"""
+        self.table = Table(Place)
+        self.attrs = {"__class__": "Place",
+                      "id": "0f3d2a9c-5b1e-4c8a-9d7f-2e6b1a4c8d3e",
+                      "created_at": "2017-03-25T02:17:06.000003",
+                      "updated_at": "2017-03-25T02:17:07.000000",
+                      "city_id": "a", "name": "Loft", "amenity_ids": ["b"]}
+        self.row = self.table.append(self.attrs)
+
+    def test_attributes(self):
+        """Test that a row reads its attributes back from the columns"""
+        self.assertEqual(self.row.id, self.attrs["id"])
+        self.assertEqual(self.row.created_at,
+                         datetime(2017, 3, 25, 2, 17, 6, 3))
+        self.assertEqual(self.row.name, "Loft")
+        self.assertEqual(self.row.number_rooms, 0)
+        self.assertEqual(self.row.to_dict(), self.attrs)
+        self.assertIsInstance(self.row, Place)
+        with self.assertRaises(AttributeError):
+            self.row.missing
+
+    def test_packed_columns(self):
+        """Test that ids, dates and references are stored compactly"""
+        other = self.table.append(dict(self.attrs, id="not-a-uuid",
+                                       city_id="".join(["a"])))
+        self.assertEqual(len(self.table.ids), 32)
+        self.assertEqual(other.id, "not-a-uuid")
+        self.assertIs(self.table.get(0, "city_id"),
+                      self.table.get(1, "city_id"))
+
+    def test_set(self):
+        """Test that assignments go to the table through the model"""
+        self.row.name = "Barn"
+        self.row.max_guest = 4
+        self.assertEqual(self.row.name, "Barn")
+        self.assertEqual(self.row.to_dict()["max_guest"], 4)
+        del self.row.max_guest
+        self.assertEqual(self.row.max_guest, 0)
+        user = Table(User).append({"id": "1", "password": "x",
+                                   "created_at": self.attrs["created_at"],
+                                   "updated_at": self.attrs["updated_at"]})
+        self.assertEqual(user.password, "x")
+        user.password = "x"
+        self.assertNotEqual(user.password, "x")
+
+    def test_mutable_defaults(self):
+        """Test that rows without a list attribute get their own list
+        rather than the one of the class"""
+        attrs = dict(self.attrs)
+        del attrs["amenity_ids"]
+        rows = [self.table.append(dict(attrs, id=str(i))) for i in range(2)]
+        rows[0].amenity_ids.append("wifi")
+        self.assertEqual(rows[0].amenity_ids, ["wifi"])
+        self.assertEqual(rows[1].amenity_ids, [])
+        self.assertEqual(Place.amenity_ids, [])
+        self.assertEqual(rows[0].to_dict()["amenity_ids"], ["wifi"])
+
+
+if __name__ == '__main__':
+    unittest.main()
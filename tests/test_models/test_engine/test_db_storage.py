@@ -17,7 +17,9 @@ from models.user import User
 import json
 import os
 import pep8
+import sqlalchemy
 import unittest
+from unittest import mock
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -108,4 +110,221 @@ class TestFileStorage(unittest.TestCase):
         models.storage.new(new_state)
         models.storage.save()
         self.assertEqual(models.storage.count(), initial_count + 1)
-        self.assertEqual(models.storage.count(State), 1)
\ No newline at end of file
+        self.assertEqual(models.storage.count(State), 1)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_bulk_new(self):
+        """Test that bulk_new and bulk_save insert every object at once"""
+        count = models.storage.count(State)
+        states = [State(name=str(i)) for i in range(5)]
+        user = User(email="bulk@hbnb.io", password="pwd")
+        models.storage.bulk_new(states + [user])
+        self.assertEqual(models.storage.count(State), count)
+        models.storage.bulk_save()
+        models.storage.close()
+        self.assertEqual(models.storage.count(State), count + 5)
+        for state in states:
+            self.assertEqual(models.storage.get(State, state.id).name,
+                             state.name)
+        stored = models.storage.get(User, user.id)
+        self.assertEqual(stored.password, user.password)
+        for obj in states + [user]:
+            models.storage.delete(models.storage.get(type(obj), obj.id))
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_class_generation(self):
+        """Test that the generation of a class changes with its objects"""
+        state = State(name="Nevada")
+        before = (models.storage.class_generation(State),
+                  models.storage.class_generation(City))
+        models.storage.new(state)
+        self.assertNotEqual(models.storage.class_generation(State),
+                            before[0])
+        generation = models.storage.class_generation("State")
+        models.storage.save()
+        self.assertNotEqual(models.storage.class_generation(State),
+                            generation)
+        generation = models.storage.class_generation(State)
+        state.name = "Utah"
+        models.storage.save()
+        self.assertNotEqual(models.storage.class_generation(State),
+                            generation)
+        generation = models.storage.class_generation(State)
+        models.storage.delete(state)
+        self.assertNotEqual(models.storage.class_generation(State),
+                            generation)
+        models.storage.save()
+        self.assertEqual(models.storage.class_generation(City), before[1])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_object_cache(self):
+        """Test that get() reads objects from models.cache until their
+        class changes"""
+        user = User(email="cache@hbnb.io", password="pwd")
+        models.storage.new(user)
+        models.storage.save()
+        models.storage.close()
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            """records statement"""
+            statements.append(statement)
+        sqlalchemy.event.listen(engine, "before_cursor_execute", count)
+        self.addCleanup(sqlalchemy.event.remove, engine,
+                        "before_cursor_execute", count)
+        with mock.patch.object(models.storage, "_DBStorage__object_ttl", 60):
+            for i in range(3):
+                stored = models.storage.get(User, user.id)
+                self.assertEqual(stored.password, user.password)
+                self.assertEqual(stored.created_at, user.created_at)
+                models.storage.close()
+            self.assertEqual(len(statements), 1)
+            stored = models.storage.get(User, user.id)
+            stored.first_name = "Cached"
+            models.storage.save()
+            models.storage.close()
+            self.assertEqual(models.storage.get(User, user.id).first_name,
+                             "Cached")
+            models.storage.delete(models.storage.get(User, user.id))
+            models.storage.save()
+            self.assertIsNone(models.storage.get(User, user.id))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts(self):
+        """Test that counts matches count and is kept up to date without
+        running queries"""
+        models.storage.new(State(name="Nevada"))
+        models.storage.save()
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            """records statement"""
+            statements.append(statement)
+
+        models.storage.counts()
+        sqlalchemy.event.listen(engine, "before_cursor_execute", record)
+        try:
+            counts = models.storage.counts()
+            state = State(name="Utah")
+            models.storage.new(state)
+            models.storage.save()
+            statements.clear()
+            self.assertEqual(models.storage.counts()["State"],
+                             counts["State"] + 1)
+            models.storage.delete(state)
+            models.storage.save()
+            statements.clear()
+            self.assertEqual(models.storage.counts(), counts)
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", record)
+        self.assertEqual(statements, [])
+        self.assertEqual(set(counts), set(classes))
+        for name, clss in classes.items():
+            self.assertEqual(counts[name], models.storage.count(clss))
+        self.assertEqual(sum(counts.values()), models.storage.count())
+        self.assertEqual(models.storage.counts(approximate=True), counts)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_live_counts(self):
+        """Test that the counts follow commits, bulk inserts and rollbacks,
+        and are counted again after writes made elsewhere"""
+        storage = models.storage
+        counts = storage.counts()
+        user = User(email="counts@hbnb.io", password="pwd")
+        state = State(name="Nevada")
+        cities = [City(name="Reno", state_id=state.id),
+                  City(name="Vegas", state_id=state.id)]
+        place = Place(name="Loft", city_id=cities[0].id, user_id=user.id)
+        for obj in [user, state] + cities:
+            storage.new(obj)
+        storage.save()
+        storage.bulk_new([place])
+        storage.bulk_save()
+        self.assertEqual(storage.counts()["City"], counts["City"] + 2)
+        self.assertEqual(storage.place_counts()["states"][state.id], 1)
+        storage.new(State(name="Rolled back"))
+        # flushed by the query, then rolled back
+        self.assertEqual(storage.count(State), counts["State"] + 2)
+        storage.close()
+        self.assertEqual(storage.counts()["State"], counts["State"] + 1)
+        place = storage.get(Place, place.id)
+        place.city_id = cities[1].id
+        storage.save()
+        self.assertEqual(storage.place_counts()["cities"],
+                         {cities[1].id: 1})
+        with storage._DBStorage__engine.begin() as conn:
+            conn.execute(sqlalchemy.delete(Place.__table__))
+        models.cache.bump(["Place"])
+        self.assertEqual(storage.counts()["Place"], 0)
+        self.assertEqual(storage.place_counts(),
+                         {"cities": {}, "states": {}})
+        for obj in cities + [state, user]:
+            storage.delete(obj)
+        storage.save()
+        self.assertEqual(storage.counts(), dict(counts, Place=0))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts_ttl(self):
+        """Test that without a shared cache backend the counts see the
+        writes of other processes once HBNB_MYSQL_COUNTS_TTL passed"""
+        storage = models.storage
+        counts = storage.counts()
+        state = State(name="Elsewhere")
+        city = City(name="Elsewhere", state_id=state.id)
+        engine = storage._DBStorage__engine
+        # as another process would, without bumping the generations
+        with engine.begin() as conn:
+            for obj in (state, city):
+                conn.execute(sqlalchemy.insert(type(obj).__table__)
+                             .values(id=obj.id, name=obj.name,
+                                     created_at=obj.created_at,
+                                     updated_at=obj.updated_at,
+                                     **({"state_id": state.id}
+                                        if obj is city else {})))
+        try:
+            self.assertEqual(storage.counts(), counts)
+            with mock.patch.object(storage, "_DBStorage__counts_ttl",
+                                   1e-9):
+                self.assertEqual(storage.counts(),
+                                 dict(counts, State=counts["State"] + 1,
+                                      City=counts["City"] + 1))
+                self.assertEqual(storage.place_counts(),
+                                 {"cities": {}, "states": {}})
+        finally:
+            with engine.begin() as conn:
+                conn.execute(sqlalchemy.delete(City.__table__)
+                             .where(City.id == city.id))
+                conn.execute(sqlalchemy.delete(State.__table__)
+                             .where(State.id == state.id))
+            models.cache.bump(["State", "City"])
+        self.assertEqual(storage.counts(), counts)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_status(self):
+        """Test the pool settings and metrics"""
+        env = {"HBNB_ENV": "", "HBNB_MYSQL_POOL_SIZE": "2",
+               "HBNB_MYSQL_MAX_OVERFLOW": "1",
+               "HBNB_MYSQL_POOL_TIMEOUT": "0.1"}
+        with mock.patch.dict(os.environ, env):
+            storage = DBStorage()
+        if storage.pool_status()["pool"] != "TimedQueuePool":
+            self.skipTest("single connection database")
+        engine = storage._DBStorage__engine
+        connections = [engine.connect() for i in range(3)]
+        status = storage.pool_status()
+        self.assertEqual(status["size"], 2)
+        self.assertEqual(status["checked_out"], 3)
+        self.assertEqual(status["overflow"], 1)
+        with self.assertRaises(sqlalchemy.exc.TimeoutError):
+            engine.connect()
+        for connection in connections:
+            connection.close()
+        status = storage.pool_status()
+        self.assertEqual(status["checked_out"], 0)
+        self.assertEqual(status["waits"], 4)
+        self.assertEqual(status["timeouts"], 1)
+        self.assertGreaterEqual(status["max_wait"], 0.1)
+        engine.dispose()
@@ -7,6 +7,7 @@ from datetime import datetime
 import inspect
 import models
 from models.engine import file_storage
+from models.engine.serializers import detect, formats
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -15,8 +16,10 @@ from models.review import Review
 from models.state import State
 from models.user import User
 import json
+import multiprocessing
 import os
 import pep8
+import threading
 import unittest
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
@@ -70,6 +73,12 @@ class TestFileStorageDocs(unittest.TestCase):
 
 class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
+    def tearDown(self):
+        """Writes the objects left by each test to file.json, so that the
+        next save() has no changes from disk to merge"""
+        if models.storage_t != 'db':
+            FileStorage().compact()
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_all_returns_dict(self):
         """Test that all returns the FileStorage.__objects attr"""
@@ -134,4 +143,486 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         self.assertEqual(storage.count(), initial_count + 1)
         self.assertEqual(storage.count(BaseModel), initial_count + 1)
-        self.assertEqual(storage.count(User), 0)
\ No newline at end of file
+        self.assertEqual(storage.count(User), 0)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_bulk_new(self):
+        """Test that bulk_new and bulk_save store every object at once"""
+        storage = FileStorage()
+        storage.page(State)
+        states = [State(name=str(i)) for i in range(5)]
+        storage.bulk_new(states)
+        storage.bulk_save()
+        for state in states:
+            self.assertIs(storage.get(State, state.id), state)
+        with open("file.json") as f:
+            saved = json.load(f)
+        for state in states:
+            self.assertEqual(saved["State." + state.id]["name"], state.name)
+        order = storage.page(State)
+        self.assertEqual(order, sorted(order, key=lambda s: (s.created_at,
+                                                             s.id)))
+        self.assertTrue(set(states) <= set(order))
+        for state in states:
+            storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_class_generation(self):
+        """Test that the generation of a class changes with its objects"""
+        storage = FileStorage()
+        state = State(name="Nevada")
+        before = (storage.class_generation(State),
+                  storage.class_generation(City))
+        storage.new(state)
+        self.assertNotEqual(storage.class_generation(State), before[0])
+        generation = storage.class_generation("State")
+        storage.save()
+        self.assertNotEqual(storage.class_generation(State), generation)
+        generation = storage.class_generation(State)
+        storage.delete(state)
+        self.assertNotEqual(storage.class_generation(State), generation)
+        storage.save()
+        self.assertEqual(storage.class_generation(City), before[1])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_generation(self):
+        """Test that reload only changes the generations of the classes
+        whose objects changed in the file"""
+        storage = FileStorage()
+        storage.new(State(name="Nevada"))
+        storage.save()
+        storage.reload()
+        before = storage.class_generations((State, City))
+        storage.reload()
+        self.assertEqual(storage.class_generations((State, City)), before)
+        # written by another process
+        path = storage._FileStorage__file_path
+        serializer = storage._FileStorage__serializer
+        city = City(name="Elsewhere")
+        jo = serializer.load(path)
+        jo["City." + city.id] = city.to_dict()
+        serializer.dump(path, jo.items())
+        storage.reload()
+        generations = storage.class_generations((State, City))
+        self.assertEqual(generations[0], before[0])
+        self.assertNotEqual(generations[1], before[1])
+        self.assertIsNotNone(storage.get(City, city.id))
+        storage.delete(storage.get(City, city.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Test that counts gives the count of every class"""
+        storage = FileStorage()
+        storage.new(State(name="Nevada"))
+        counts = storage.counts()
+        self.assertEqual(set(counts), set(classes))
+        for name, clss in classes.items():
+            self.assertEqual(counts[name], storage.count(clss))
+        self.assertEqual(sum(counts.values()), storage.count())
+        self.assertEqual(storage.counts(approximate=True), counts)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_place_counts(self):
+        """Test that place_counts follows the places of states and cities"""
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            storage = FileStorage()
+            state = State(name="Nevada")
+            cities = [City(name="Reno", state_id=state.id),
+                      City(name="Vegas", state_id=state.id)]
+            place = Place(name="Loft", city_id=cities[0].id)
+            for obj in [state, place] + cities:
+                storage.new(obj)
+            storage.new(Place(name="Orphan", city_id="missing"))
+            self.assertEqual(storage.place_counts(),
+                             {"cities": {cities[0].id: 1},
+                              "states": {state.id: 1}})
+            place.city_id = cities[1].id
+            storage.new(Place(name="Barn", city_id=cities[1].id))
+            self.assertEqual(storage.place_counts(),
+                             {"cities": {cities[1].id: 2},
+                              "states": {state.id: 2}})
+            storage.delete(place)
+            self.assertEqual(storage.place_counts()["states"], {state.id: 1})
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_skips_unchanged_file(self):
+        """Test that close only reloads when file.json changed on disk"""
+        storage = FileStorage()
+        storage.new(BaseModel())
+        storage.save()
+        generation = storage.generation
+        self.assertFalse(storage.changed())
+        storage.close()
+        self.assertEqual(storage.generation, generation)
+        with open("file.json", "a") as f:
+            f.write(" ")
+        self.assertTrue(storage.changed())
+        storage.close()
+        self.assertEqual(storage.generation, generation + 1)
+        self.assertFalse(storage.changed())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_journal(self):
+        """Test that journal mode appends changes and compacts them"""
+        storage = FileStorage()
+        journal = FileStorage._FileStorage__journal
+        FileStorage._FileStorage__journal_max = 3
+        try:
+            storage.compact()
+            kept = State(name="California")
+            gone = State(name="Nevada")
+            storage.new(kept)
+            storage.new(gone)
+            storage.save()
+            self.assertEqual(len(journal), 2)
+            with open("file.json", "r") as f:
+                self.assertNotIn("State." + kept.id, json.load(f))
+            storage.delete(gone)
+            storage.save()
+            self.assertEqual(len(journal), 0)
+            with open("file.json", "r") as f:
+                js = json.load(f)
+            self.assertIn("State." + kept.id, js)
+            self.assertNotIn("State." + gone.id, js)
+            kept.name = "Arizona"
+            storage.new(kept)
+            storage.save()
+            del FileStorage._FileStorage__objects["State." + kept.id]
+            storage.reload()
+            self.assertEqual(storage.get(State, kept.id).name, "Arizona")
+        finally:
+            FileStorage._FileStorage__journal_max = 0
+            storage.compact()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_class_buckets(self):
+        """Test that all(cls) and count(cls) follow new, delete and reload"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            state = State()
+            city = City()
+            storage.new(state)
+            storage.new(city)
+            self.assertEqual(storage.all(State), {"State." + state.id: state})
+            self.assertEqual(storage.all("City"), {"City." + city.id: city})
+            self.assertEqual(storage.count(State), 1)
+            self.assertEqual(storage.count(Place), 0)
+            self.assertIs(storage.get("State", state.id), state)
+            storage.delete(state)
+            self.assertEqual(storage.all(State), {})
+            self.assertEqual(storage.count(State), 0)
+            storage.all()["State." + state.id] = state
+            self.assertEqual(storage.count(State), 1)
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            self.assertEqual(storage.count(City), 0)
+            storage.reload()
+            self.assertEqual(storage.count(City), 1)
+            self.assertEqual(storage.get(City, city.id).id, city.id)
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reverse_indexes(self):
+        """Test that relationship getters follow the reverse indexes"""
+        storage = models.storage
+        state = State(name="California")
+        other = State(name="Nevada")
+        city = City(name="Fresno", state_id=state.id)
+        place = Place(city_id=city.id, user_id="u")
+        amenity = Amenity(name="Wifi")
+        for obj in (state, other, city, place, amenity):
+            storage.new(obj)
+        self.assertEqual(state.cities, [city])
+        self.assertEqual(city.places, [place])
+        city.state_id = other.id
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        review = Review(place_id=place.id, user_id="u", text="ok")
+        self.assertEqual(place.reviews, [])
+        storage.new(review)
+        self.assertEqual(place.reviews, [review])
+        place.amenity_ids.append(amenity.id)
+        place.save()
+        self.assertEqual(place.amenities, [amenity])
+        self.assertEqual(storage.related(Place, "amenity_ids", amenity.id),
+                         [place])
+        storage.delete(review)
+        self.assertEqual(place.reviews, [])
+        for obj in (state, other, city, place, amenity):
+            storage.delete(obj)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page(self):
+        """Test keyset pages ordered by (created_at, id)"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            t = datetime(2017, 9, 28, 21, 3, 54, 52298)
+            states = [State(id=str(i), created_at=t.isoformat())
+                      for i in (3, 1, 2)]
+            for state in states:
+                storage.new(state)
+            self.assertEqual([s.id for s in storage.page(State)],
+                             ["1", "2", "3"])
+            self.assertEqual([s.id for s in storage.page(State, 2)],
+                             ["1", "2"])
+            self.assertEqual([s.id for s in storage.page(State, 2, (t, "2"))],
+                             ["3"])
+            storage.delete(states[0])
+            storage.new(State(id="0", created_at=t.isoformat()))
+            self.assertEqual([s.id for s in storage.page(State)],
+                             ["0", "1", "2"])
+            city = City(state_id="1")
+            storage.new(city)
+            self.assertEqual(storage.page(City, attr="state_id", id="1"),
+                             [city])
+            self.assertEqual(storage.page(City, attr="state_id", id="2"), [])
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_reload(self):
+        """Test that lazy mode instantiates objects on first access"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__load_mode = "lazy"
+        try:
+            state = State(name="California")
+            city = City(name="Fresno", state_id=state.id)
+            other = City(name="Reno")
+            for obj in (state, city, other):
+                storage.new(obj)
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            objects = FileStorage._FileStorage__objects
+            self.assertTrue(all(type(v) is dict for v in objects.values()))
+            self.assertEqual(storage.count(City), 2)
+            loaded = storage.get(State, state.id)
+            self.assertIs(type(loaded), State)
+            self.assertEqual(loaded.name, "California")
+            self.assertIs(type(objects["City." + other.id]), dict)
+            self.assertEqual([c.id for c in loaded.cities], [city.id])
+            self.assertIs(type(objects["City." + city.id]), City)
+            self.assertIs(type(objects["City." + other.id]), dict)
+            self.assertEqual([c.id for c in storage.page(City)],
+                             [city.id, other.id])
+            storage.save()
+            self.assertTrue(all(type(v) is not dict
+                                for v in storage.all().values()))
+        finally:
+            FileStorage._FileStorage__load_mode = "eager"
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_binary_format(self):
+        """Test that the binary format saves and reloads the objects"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        path = FileStorage._FileStorage__file_path
+        serializer = FileStorage._FileStorage__serializer
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__serializer = formats["binary"]
+        FileStorage._FileStorage__file_path = "file.bin"
+        try:
+            state = State(name="California")
+            storage.new(state)
+            storage.save()
+            self.assertIs(detect("file.bin"), formats["binary"])
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage.get(State, state.id).to_dict(),
+                             state.to_dict())
+        finally:
+            FileStorage._FileStorage__serializer = serializer
+            FileStorage._FileStorage__file_path = path
+            FileStorage._FileStorage__objects = save
+            if os.path.exists("file.bin"):
+                os.remove("file.bin")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_mmap_reload(self):
+        """Test that mmap mode decodes the snapshot objects on access"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        path = FileStorage._FileStorage__file_path
+        serializer = FileStorage._FileStorage__serializer
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__serializer = formats["binary"]
+        FileStorage._FileStorage__file_path = "file.bin"
+        FileStorage._FileStorage__load_mode = "mmap"
+        try:
+            state = State(name="California")
+            cities = [City(name=str(i), state_id=state.id)
+                      for i in range(100)]
+            for obj in [state] + cities:
+                storage.new(obj)
+            storage.save()
+            storage.reload()
+            objects = FileStorage._FileStorage__objects
+            self.assertEqual(objects, {})
+            self.assertEqual(storage.count(), 101)
+            self.assertEqual(storage.count(City), 100)
+            loaded = storage.get(City, cities[50].id)
+            self.assertEqual(loaded.to_dict(), cities[50].to_dict())
+            self.assertEqual(list(objects), ["City." + cities[50].id])
+            self.assertIsNone(storage.get(City, state.id))
+            storage.delete(storage.get(State, state.id))
+            other = State(name="Nevada")
+            storage.new(other)
+            self.assertEqual(storage.count(State), 1)
+            self.assertEqual(storage.count(), 101)
+            storage.reload()
+            self.assertIsNone(storage.get(State, state.id))
+            self.assertIs(storage.get(State, other.id), other)
+            self.assertEqual(len(storage.all(City)), 100)
+            self.assertEqual(storage.count(), 101)
+            storage.save()
+            self.assertEqual(list(objects), [])
+            self.assertEqual(storage.count(), 101)
+        finally:
+            FileStorage._FileStorage__load_mode = "eager"
+            FileStorage._FileStorage__serializer = serializer
+            FileStorage._FileStorage__file_path = path
+            storage.reload()
+            FileStorage._FileStorage__objects = save
+            if os.path.exists("file.bin"):
+                os.remove("file.bin")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_atomic_save(self):
+        """Test that save replaces the file and reload reports corruption"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            storage.new(State(name="California"))
+            storage.save()
+            inode = os.stat("file.json").st_ino
+            storage.new(State(name="Nevada"))
+            storage.save()
+            self.assertNotEqual(os.stat("file.json").st_ino, inode)
+            self.assertEqual([name for name in os.listdir(".")
+                              if name.startswith("file.json.")],
+                             ["file.json.lock"])
+            with open("file.json", "w") as f:
+                f.write('{"State.1": {')
+            with self.assertRaises(ValueError):
+                storage.reload()
+            os.remove("file.json")
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_concurrent_save(self):
+        """Test that threads and processes saving together lose nothing"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+
+        def create():
+            """creates and saves a few states"""
+            for i in range(10):
+                storage.new(State(name=str(i)))
+                storage.save()
+
+        try:
+            storage.compact()
+            threads = [threading.Thread(target=create) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(storage.count(State), 40)
+            if file_storage.fcntl is None:
+                return
+            context = multiprocessing.get_context("fork")
+            processes = [context.Process(target=create) for i in range(4)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            storage.reload()
+            self.assertEqual(storage.count(State), 80)
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_group_commit(self):
+        """Test that concurrent saves are written together"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__commit_window = 0.05
+        states = [State(name=str(i)) for i in range(8)]
+
+        def create(state):
+            """creates and saves state"""
+            storage.new(state)
+            storage.save()
+
+        try:
+            generation = storage.generation
+            threads = [threading.Thread(target=create, args=(state,))
+                       for state in states]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertLess(storage.generation - generation, len(states))
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage.count(State), len(states))
+        finally:
+            FileStorage._FileStorage__commit_window = 0
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_reload(self):
+        """Test that compact mode keeps the objects in columnar rows"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__load_mode = "compact"
+        try:
+            state = State(name="California")
+            city = City(name="Fresno", state_id=state.id)
+            for obj in (state, city):
+                storage.new(obj)
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            loaded = storage.get(State, state.id)
+            self.assertIsNot(type(loaded), State)
+            self.assertIsInstance(loaded, State)
+            self.assertEqual(loaded.to_dict(), state.to_dict())
+            self.assertEqual(loaded.__dict__, state.__dict__)
+            self.assertTrue(str(loaded).startswith("[State] (" + state.id))
+            self.assertEqual([c.id for c in loaded.cities], [city.id])
+            row = storage.get(City, city.id)
+            row.state_id = "other"
+            self.assertEqual(loaded.cities, [])
+            self.assertEqual(storage.related(State, "id", "x"), [])
+            self.assertEqual(storage.related(City, "state_id", "other"),
+                             [row])
+            loaded.delete()
+            row.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertIsNone(storage.get(State, state.id))
+            self.assertEqual(storage.get(City, city.id).state_id, "other")
+        finally:
+            FileStorage._FileStorage__load_mode = "eager"
+            FileStorage._FileStorage__objects = save
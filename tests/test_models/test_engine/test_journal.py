@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Contains the TestJournalDocs and TestJournal classes
+"""
+
+import inspect
+from models.engine import journal
+import os
+import pep8
+import unittest
+Journal = journal.Journal
+
+
+class TestJournalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Journal class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.journal_f = inspect.getmembers(Journal, inspect.isfunction)
+
+    def test_pep8_conformance_journal(self):
+        """Test that models/engine/journal.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/journal.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_journal.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_journal_module_docstring(self):
+        """Test for the journal.py module docstring"""
+        self.assertIsNot(journal.__doc__, None,
+                         "journal.py needs a docstring")
+        self.assertTrue(len(journal.__doc__) >= 1,
+                        "journal.py needs a docstring")
+
+    def test_journal_func_docstrings(self):
+        """Test for the presence of docstrings in Journal methods"""
+        self.assertIsNot(Journal.__doc__, None)
+        for func in self.journal_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestJournal(unittest.TestCase):
+    """Test the Journal class"""
+    def setUp(self):
+        """Starts every test from an empty journal"""
+        self.journal = Journal("test_journal.jsonl")
+        self.journal.clear()
+
+    def tearDown(self):
+        """Removes the journal file"""
+        self.journal.clear()
+
+    def test_append_replay(self):
+        """Test that appended records are replayed in order"""
+        self.journal.append({"State.1": {"name": "a"}, "State.2": None})
+        self.journal.append({"State.1": {"name": "b"}})
+        self.assertEqual(len(self.journal), 3)
+        self.assertEqual(list(Journal(self.journal.path).replay()),
+                         [("State.1", {"name": "a"}), ("State.2", None),
+                          ("State.1", {"name": "b"})])
+
+    def test_torn_tail(self):
+        """Test that a partially written last record is ignored"""
+        self.journal.append({"State.1": {"name": "a"}})
+        with open(self.journal.path, "a") as f:
+            f.write('{"key": "State.2", "val')
+        reopened = Journal(self.journal.path)
+        self.assertEqual(list(reopened.replay()), [("State.1", {"name": "a"})])
+        self.assertEqual(len(reopened), 1)
+
+    def test_append_after_torn_tail(self):
+        """Test that a record appended after a crash is replayed, the
+        partial record being dropped from the file"""
+        self.journal.append({"State.1": {"name": "a"}})
+        with open(self.journal.path, "a") as f:
+            f.write('{"key": "State.2", "val')
+        reopened = Journal(self.journal.path)
+        reopened.append({"State.3": {"name": "after-crash"}})
+        self.assertEqual(list(Journal(self.journal.path).replay()),
+                         [("State.1", {"name": "a"}),
+                          ("State.3", {"name": "after-crash"})])
+        with open(self.journal.path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(len(reopened), 2)
+        with open(self.journal.path, "w") as f:
+            f.write('{"key": "State.2", "val')
+        Journal(self.journal.path).append({"State.3": None})
+        self.assertEqual(list(Journal(self.journal.path).replay()),
+                         [("State.3", None)])
+
+    def test_unreadable_record(self):
+        """Test that an unreadable record does not hide the next ones"""
+        with open(self.journal.path, "w") as f:
+            f.write('{"key": "State.2", "val{"key": "State.3", '
+                    '"value": null}\n{"key": "State.4", "value": null}\n')
+        self.assertEqual(list(Journal(self.journal.path).replay()),
+                         [("State.4", None)])
+
+    def test_clear(self):
+        """Test that clear removes the journal file"""
+        self.journal.append({"State.1": None})
+        self.journal.clear()
+        self.assertFalse(os.path.exists(self.journal.path))
+        self.assertEqual(len(self.journal), 0)
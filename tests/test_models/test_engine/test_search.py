@@ -0,0 +1,182 @@
+#!/usr/bin/python3
+"""
+Contains the TestSearchDocs, TestSearch and TestStorageSearch classes
+"""
+
+import inspect
+import models
+from models.engine import search
+from models.engine.file_storage import FileStorage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestSearchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the search module"""
+    def test_pep8_conformance_search(self):
+        """Test that models/engine/search.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/search.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_search.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_search_docstrings(self):
+        """Test for the module and function docstrings"""
+        self.assertTrue(len(search.__doc__) >= 1)
+        for func in inspect.getmembers(search, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestSearch(unittest.TestCase):
+    """Test the search_places function"""
+    def setUp(self):
+        """Fills an empty storage with two states, three cities and four
+        places"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.storage = models.storage
+        self.ca = State(name="California")
+        self.nv = State(name="Nevada")
+        self.sf = City(name="San Francisco", state_id=self.ca.id)
+        self.la = City(name="Los Angeles", state_id=self.ca.id)
+        self.lv = City(name="Las Vegas", state_id=self.nv.id)
+        self.wifi = Amenity(name="Wifi")
+        self.pool = Amenity(name="Pool")
+        self.p1 = Place(city_id=self.sf.id, amenity_ids=[self.wifi.id])
+        self.p2 = Place(city_id=self.la.id,
+                        amenity_ids=[self.wifi.id, self.pool.id])
+        self.p3 = Place(city_id=self.lv.id, amenity_ids=[self.pool.id])
+        self.p4 = Place(city_id=self.lv.id)
+        for obj in (self.ca, self.nv, self.sf, self.la, self.lv, self.wifi,
+                    self.pool, self.p1, self.p2, self.p3, self.p4):
+            self.storage.new(obj)
+
+    def tearDown(self):
+        """Restores the storage content"""
+        FileStorage._FileStorage__objects = self.saved
+
+    def search(self, **kwargs):
+        """runs search_places on the test storage"""
+        return search.search_places(self.storage, **kwargs)
+
+    def test_no_filter(self):
+        """Test that every place is returned without filters"""
+        self.assertEqual(self.search(), [self.p1, self.p2, self.p3, self.p4])
+
+    def test_states_and_cities(self):
+        """Test that listed cities come first, then the states' cities"""
+        self.assertEqual(self.search(states=[self.ca.id]), [self.p1, self.p2])
+        self.assertEqual(self.search(states=[self.ca.id],
+                                     cities=[self.lv.id, self.sf.id]),
+                         [self.p3, self.p4, self.p1, self.p2])
+        self.assertEqual(self.search(cities=["unknown"]),
+                         [self.p1, self.p2, self.p3, self.p4])
+
+    def test_amenities(self):
+        """Test that places must have every listed amenity"""
+        self.assertEqual(self.search(amenities=[self.wifi.id]),
+                         [self.p1, self.p2])
+        self.assertEqual(self.search(amenities=[self.wifi.id,
+                                                self.pool.id]),
+                         [self.p2])
+        self.assertEqual(self.search(states=[self.nv.id],
+                                     amenities=[self.pool.id, "unknown"]),
+                         [self.p3])
+        self.assertEqual(self.search(states=[self.nv.id],
+                                     amenities=[self.wifi.id]), [])
+
+
+class TestStorageSearch(unittest.TestCase):
+    """Test the search_places method of the storage engines"""
+    def setUp(self):
+        """Stores two states, three cities and four places"""
+        self.storage = models.storage
+        self.user = User(email="search@hbnb.io", password="pwd")
+        self.ca = State(name="California")
+        self.nv = State(name="Nevada")
+        self.sf = City(name="San Francisco", state_id=self.ca.id)
+        self.la = City(name="Los Angeles", state_id=self.ca.id)
+        self.lv = City(name="Las Vegas", state_id=self.nv.id)
+        self.wifi = Amenity(name="Wifi")
+        self.pool = Amenity(name="Pool")
+        self.places = [Place(name=str(i), user_id=self.user.id,
+                             city_id=city.id)
+                       for i, city in enumerate((self.sf, self.la, self.lv,
+                                                 self.lv))]
+        self.p1, self.p2, self.p3, self.p4 = self.places
+        self.link(self.p1, self.wifi)
+        self.link(self.p2, self.wifi, self.pool)
+        self.link(self.p3, self.pool)
+        self.objs = [self.user, self.ca, self.nv, self.sf, self.la, self.lv,
+                     self.wifi, self.pool] + self.places
+        for obj in self.objs:
+            self.storage.new(obj)
+        self.storage.save()
+
+    def tearDown(self):
+        """Removes the stored objects"""
+        for obj in reversed(self.objs):
+            self.storage.delete(obj)
+        self.storage.save()
+
+    def link(self, place, *amenities):
+        """gives amenities to place"""
+        for amenity in amenities:
+            if models.storage_t == 'db':
+                place.amenities.append(amenity)
+            else:
+                place.amenity_ids.append(amenity.id)
+
+    def search(self, **kwargs):
+        """returns the names of the places found by the storage"""
+        return sorted(place.name
+                      for place in self.storage.search_places(**kwargs))
+
+    def test_states_and_cities(self):
+        """Test the places of the listed states and cities"""
+        self.assertEqual(self.search(states=[self.ca.id]), ["0", "1"])
+        self.assertEqual(self.search(states=[self.ca.id],
+                                     cities=[self.lv.id, self.sf.id]),
+                         ["0", "1", "2", "3"])
+        self.assertEqual(len(self.search(cities=["unknown"])),
+                         self.storage.count(Place))
+
+    def test_amenities(self):
+        """Test that places must have every listed amenity"""
+        self.assertEqual(self.search(states=[self.ca.id, self.nv.id],
+                                     amenities=[self.wifi.id]), ["0", "1"])
+        self.assertEqual(self.search(states=[self.ca.id, self.nv.id],
+                                     amenities=[self.wifi.id, self.pool.id,
+                                                self.pool.id]), ["1"])
+        self.assertEqual(self.search(states=[self.nv.id],
+                                     amenities=[self.pool.id, "unknown"]),
+                         ["2"])
+        self.assertEqual(self.search(states=[self.nv.id],
+                                     amenities=[self.wifi.id]), [])
+        self.assertEqual(self.search(states=[self.nv.id],
+                                     amenities=["unknown"]), ["2", "3"])
+
+    def test_paging(self):
+        """Test that limit and after page through the places in (created_at,
+        id) order"""
+        order = sorted(self.places, key=lambda p: (p.created_at, p.id))
+        found = []
+        after = None
+        while True:
+            page = list(self.storage.search_places(
+                cities=[self.sf.id, self.la.id, self.lv.id], limit=3,
+                after=after))
+            if not page:
+                break
+            found.extend(page)
+            after = (page[-1].created_at, page[-1].id)
+        self.assertEqual([p.id for p in found], [p.id for p in order])
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""
+Contains the TestSerializersDocs and TestSerializers classes
+"""
+
+import inspect
+from models.engine import serializers
+from models.city import City
+from models.state import State
+import os
+import pep8
+import unittest
+
+
+class TestSerializersDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the serializers"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.classes = [serializers.JSONSerializer,
+                       serializers.BinarySerializer]
+
+    def test_pep8_conformance_serializers(self):
+        """Test that models/engine/serializers.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/serializers.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_serializers.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_serializers_module_docstring(self):
+        """Test for the serializers.py module docstring"""
+        self.assertIsNot(serializers.__doc__, None,
+                         "serializers.py needs a docstring")
+        self.assertTrue(len(serializers.__doc__) >= 1,
+                        "serializers.py needs a docstring")
+
+    def test_serializers_func_docstrings(self):
+        """Test for the presence of docstrings in the serializers"""
+        for func in inspect.getmembers(serializers, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+        for cls in self.classes:
+            self.assertIsNot(cls.__doc__, None)
+            for func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertIsNot(func[1].__doc__, None,
+                                 "{:s} method needs a docstring".format(
+                                     func[0]))
+
+
+class TestSerializers(unittest.TestCase):
+    """Test the snapshot serializers"""
+    def setUp(self):
+        """Builds a few objects to serialize"""
+        state = State(name="California")
+        city = City(name="Fresno", state_id=state.id)
+        self.objects = {"State." + state.id: state,
+                        "City." + city.id: city.to_dict()}
+        self.expected = {"State." + state.id: state.to_dict(),
+                         "City." + city.id: city.to_dict()}
+        self.paths = ["test_snapshot.json", "test_snapshot.bin"]
+
+    def tearDown(self):
+        """Removes the snapshot files"""
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_round_trip(self):
+        """Test that every format reads back what it wrote"""
+        for name, path in zip(("json", "binary"), self.paths):
+            with self.subTest(format=name):
+                serializer = serializers.formats[name]
+                serializer.dump(path, self.objects.items())
+                self.assertEqual(serializer.load(path), self.expected)
+                self.assertIs(serializers.detect(path), serializer)
+                cities = {key: value for key, value in self.expected.items()
+                          if key.startswith("City.")}
+                self.assertEqual(serializer.load(path, ["City"]), cities)
+
+    def test_binary_index(self):
+        """Test that the binary header indexes the class sections"""
+        binary = serializers.formats["binary"]
+        binary.dump(self.paths[1], self.objects.items())
+        with open(self.paths[1], 'rb') as f:
+            index = binary.index(f.read())
+        self.assertEqual(set(index), {"State", "City"})
+        self.assertEqual([entry[2] for entry in index.values()], [1, 1])
+        with self.assertRaises(ValueError):
+            serializers.formats["json"].load(self.paths[1])
+
+    def test_snapshot(self):
+        """Test that a mapped snapshot finds objects without loading all"""
+        binary = serializers.formats["binary"]
+        states = [State(name=str(i)) for i in range(100)]
+        binary.dump(self.paths[1], (("State." + state.id, state)
+                                    for state in states))
+        snapshot = binary.open(self.paths[1])
+        try:
+            self.assertEqual(snapshot.count("State"), 100)
+            self.assertEqual(snapshot.count("City"), 0)
+            for state in states:
+                self.assertEqual(snapshot.get("State", state.id),
+                                 state.to_dict())
+            self.assertIsNone(snapshot.get("State", "missing"))
+            self.assertIsNone(snapshot.get("City", states[0].id))
+            self.assertEqual([obj["name"] for obj in
+                              snapshot.records("State")],
+                             [str(i) for i in range(100)])
+        finally:
+            snapshot.close()
+
+    def test_convert(self):
+        """Test the conversion between file.json and the binary format"""
+        serializers.formats["json"].dump(self.paths[0], self.objects.items())
+        os.rename(self.paths[0], "test_snapshot.orig")
+        self.paths.append("test_snapshot.orig")
+        writer = serializers.convert("test_snapshot.orig", self.paths[1])
+        self.assertIs(writer, serializers.formats["binary"])
+        writer = serializers.convert(self.paths[1], self.paths[0])
+        self.assertIs(writer, serializers.formats["json"])
+        self.assertEqual(writer.load(self.paths[0]), self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()